@@ -1,22 +1,41 @@
 #!/usr/bin/env python3
+import asyncio
+import fcntl
+import functools
 import os
 import json
+import re
+import struct
 import time
 import socket
-import psutil
 import subprocess
 import logging
-import platform
+import logging.handlers
 import signal
 import sys
-from datetime import datetime, timezone
 from typing import List, Any, Dict, Optional
 
 import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
 from .sensors import EnviroPlusSensors
 from .settings import SettingsManager
 from . import __version__
 
+# Optional JSON accelerator: orjson serializes to bytes in C, which paho
+# publishes directly without a str->bytes encode. Fall back to stdlib json.
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+
 APP_NAME = "ha-enviro-plus"
 VERSION = __version__
 
@@ -33,6 +52,10 @@ CPU_TEMP_FACTOR = float(os.getenv("CPU_TEMP_FACTOR", "1.8"))
 CPU_TEMP_SMOOTHING = float(os.getenv("CPU_TEMP_SMOOTHING", "0.1"))
 LOG_TO_FILE = int(os.getenv("LOG_TO_FILE", "0")) == 1
 LOG_PATH = f"/var/log/{APP_NAME}.log"
+# Optional scheduler tuning: pin the agent to one CPU and/or adjust its
+# niceness to reduce poll jitter. Both are off unless set.
+PIN_CPU = os.getenv("PIN_CPU", "")
+NICE = os.getenv("NICE", "")
 # ------------------------------------------------------------
 
 hostname = socket.gethostname()
@@ -41,40 +64,89 @@ root = device_id  # topic root for states & commands
 avail_t = f"{root}/status"
 cmd_t = f"{root}/cmd"  # expects: reboot|shutdown|restart
 set_t = f"{root}/set/+"  # retained settings, e.g. set/temp_offset
+state_t = f"{root}/state"  # aggregated JSON state bundle
+
+
+# IP addresses change on the order of hours, so avoid re-enumerating every
+# interface on each poll cycle.
+_IP_CACHE_TTL_SEC = 60.0
+_ip_cache: Dict[str, Any] = {"val": None, "ts": 0.0}
+
+_SIOCGIFADDR = 0x8915
+
+
+def _iface_ipv4(sock: socket.socket, name: str) -> str:
+    """
+    Get the IPv4 address of a single interface via the SIOCGIFADDR ioctl.
+
+    One syscall per interface, versus getifaddrs() materializing an
+    object graph for every address on the host.
+
+    Raises:
+        OSError: if the interface does not exist or has no IPv4 address
+    """
+    packed = struct.pack("256s", name.encode()[:15])
+    return socket.inet_ntoa(fcntl.ioctl(sock.fileno(), _SIOCGIFADDR, packed)[20:24])
 
 
 def get_ipv4_prefer_wlan0() -> str:
     """
     Get IPv4 address with preference for wlan0 interface.
 
+    Successful lookups are cached for a short TTL to keep the per-poll
+    cost down; failures are not cached so the next poll retries.
+
     Returns:
         IPv4 address string, or "unknown" if unable to determine
 
     Raises:
         Never raises - always returns a fallback value
     """
+    now = time.monotonic()
+    if _ip_cache["val"] is not None and now - _ip_cache["ts"] < _IP_CACHE_TTL_SEC:
+        return str(_ip_cache["val"])
     try:
-        addrs = psutil.net_if_addrs()
-        # prefer wlan0, else first non-loopback IPv4
-        if "wlan0" in addrs:
-            for a in addrs["wlan0"]:
-                if a.family.name == "AF_INET" and not a.address.startswith("127."):
-                    logger.debug("Using wlan0 IPv4 address: %s", a.address)
-                    return str(a.address)
-        for iface, lst in addrs.items():
-            for a in lst:
-                if a.family.name == "AF_INET" and not a.address.startswith("127."):
-                    logger.debug("Using %s IPv4 address: %s", iface, a.address)
-                    return str(a.address)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            # prefer wlan0, else first non-loopback IPv4
+            try:
+                addr = _iface_ipv4(s, "wlan0")
+                if not addr.startswith("127."):
+                    logger.debug("Using wlan0 IPv4 address: %s", addr)
+                    _ip_cache["val"] = addr
+                    _ip_cache["ts"] = now
+                    return addr
+            except OSError:
+                pass
+            for _idx, iface in socket.if_nameindex():
+                if iface == "wlan0":
+                    continue
+                try:
+                    addr = _iface_ipv4(s, iface)
+                except OSError:
+                    continue
+                if not addr.startswith("127."):
+                    logger.debug("Using %s IPv4 address: %s", iface, addr)
+                    _ip_cache["val"] = addr
+                    _ip_cache["ts"] = now
+                    return addr
     except Exception as e:
         logger.error("Failed to get network address: %s", e)
         logger.info("Network address will be reported as 'unknown'")
     return "unknown"
 
 
+# Boot reference on the monotonic clock (nanoseconds), derived from
+# /proc/uptime on the first uptime call; later calls are pure integer
+# arithmetic and immune to NTP steps of the wall clock.
+_boot_monotonic_ns: Optional[int] = None
+
+
 def get_uptime_seconds() -> int:
     """
-    Get system uptime in seconds from /proc/uptime.
+    Get system uptime in seconds.
+
+    /proc/uptime is read once to anchor the boot instant on the
+    monotonic clock; every later call just subtracts it.
 
     Returns:
         Uptime in seconds, or 0 if unable to read
@@ -82,22 +154,108 @@ def get_uptime_seconds() -> int:
     Raises:
         Never raises - always returns a fallback value
     """
+    global _boot_monotonic_ns
+    if _boot_monotonic_ns is None:
+        try:
+            with open("/proc/uptime", "r") as f:
+                uptime_str = f.read().split()[0]
+            _boot_monotonic_ns = time.monotonic_ns() - int(float(uptime_str) * 1e9)
+            logger.debug("System uptime: %d seconds", int(float(uptime_str)))
+        except (FileNotFoundError, ValueError, IndexError) as e:
+            logger.error("Failed to read system uptime: %s", e)
+            logger.info("Uptime will be reported as 0 seconds")
+            return 0
+        except Exception as e:
+            logger.error("Unexpected error reading uptime: %s", e)
+            logger.info("Uptime will be reported as 0 seconds")
+            return 0
+    return (time.monotonic_ns() - _boot_monotonic_ns) // 1_000_000_000
+
+
+# Jiffies snapshot from the previous /proc/stat read, used to compute the
+# CPU usage delta between polls.
+_cpu_stat: Dict[str, int] = {"idle": 0, "total": 0}
+
+
+def _read_cpu_percent() -> float:
+    """
+    Compute CPU usage percent from a /proc/stat jiffies delta.
+
+    Reads the aggregate cpu line directly instead of going through
+    psutil's Python-level /proc parsing. The first call establishes the
+    baseline and returns 0.0, matching psutil.cpu_percent(interval=None).
+
+    Returns:
+        CPU usage in percent, or 0.0 on the first call or on failure
+    """
+    try:
+        with open("/proc/stat", "rb") as f:
+            fields = f.readline().split()[1:]
+        values = [int(v) for v in fields]
+        idle = values[3] + (values[4] if len(values) > 4 else 0)  # idle + iowait
+        total = sum(values)
+        d_idle = idle - _cpu_stat["idle"]
+        d_total = total - _cpu_stat["total"]
+        first = _cpu_stat["total"] == 0
+        _cpu_stat["idle"] = idle
+        _cpu_stat["total"] = total
+        if first or d_total <= 0:
+            return 0.0
+        return (1.0 - d_idle / d_total) * 100.0
+    except Exception as e:
+        logger.error("Failed to read CPU usage: %s", e)
+        logger.info("CPU usage will be reported as 0.0%%")
+        return 0.0
+
+
+def _read_mem_percent() -> float:
+    """
+    Read memory usage percent directly from /proc/meminfo.
+
+    Only MemTotal and MemAvailable are needed, so this skips psutil's
+    full virtual_memory() snapshot.
+
+    Returns:
+        Memory usage in percent, or 0.0 on failure
+    """
     try:
-        with open("/proc/uptime", "r") as f:
-            uptime_str = f.read().split()[0]
-            uptime_seconds = int(float(uptime_str))
-            logger.debug("System uptime: %d seconds", uptime_seconds)
-            return uptime_seconds
-    except (FileNotFoundError, ValueError, IndexError) as e:
-        logger.error("Failed to read system uptime: %s", e)
-        logger.info("Uptime will be reported as 0 seconds")
-        return 0
+        total = avail = 0
+        with open("/proc/meminfo", "rb") as f:
+            for line in f:
+                if line.startswith(b"MemTotal:"):
+                    total = int(line.split()[1])
+                elif line.startswith(b"MemAvailable:"):
+                    avail = int(line.split()[1])
+                    break
+        if total <= 0:
+            return 0.0
+        return (1.0 - avail / total) * 100.0
     except Exception as e:
-        logger.error("Unexpected error reading uptime: %s", e)
-        logger.info("Uptime will be reported as 0 seconds")
-        return 0
+        logger.error("Failed to read memory usage: %s", e)
+        logger.info("Memory usage will be reported as 0.0%%")
+        return 0.0
 
 
+def _read_mem_size_gb() -> float:
+    """
+    Read total memory size in GB from /proc/meminfo.
+
+    Returns:
+        Total memory in GB, or 0.0 on failure
+    """
+    try:
+        with open("/proc/meminfo", "rb") as f:
+            for line in f:
+                if line.startswith(b"MemTotal:"):
+                    return int(line.split()[1]) / 1024.0 / 1024.0
+        return 0.0
+    except Exception as e:
+        logger.error("Failed to read memory size: %s", e)
+        logger.info("Memory size will be reported as 0.0 GB")
+        return 0.0
+
+
+@functools.lru_cache(maxsize=1)
 def get_model() -> str:
     """
     Get device model from /proc/device-tree/model.
@@ -124,6 +282,7 @@ def get_model() -> str:
         return "Raspberry Pi"
 
 
+@functools.lru_cache(maxsize=1)
 def get_serial() -> str:
     """
     Get device serial number from /proc/cpuinfo.
@@ -136,11 +295,12 @@ def get_serial() -> str:
     """
     try:
         with open("/proc/cpuinfo", "r") as f:
-            for line in f:
-                if line.startswith("Serial"):
-                    serial = line.split(":")[1].strip()
-                    logger.debug("Device serial: %s", serial)
-                    return serial
+            data = f.read()
+        match = re.search(r"^Serial\s*:\s*(\S+)", data, re.M)
+        if match:
+            serial = match.group(1)
+            logger.debug("Device serial: %s", serial)
+            return serial
         logger.warning("Serial number not found in cpuinfo")
         logger.info("Serial number will be reported as 'unknown'")
         return "unknown"
@@ -154,6 +314,7 @@ def get_serial() -> str:
         return "unknown"
 
 
+@functools.lru_cache(maxsize=1)
 def get_os_release() -> str:
     """
     Get OS release information from /etc/os-release or platform fallback.
@@ -168,14 +329,18 @@ def get_os_release() -> str:
         # Try to get more detailed OS info
         if os.path.exists("/etc/os-release"):
             with open("/etc/os-release", "r") as f:
-                lines = f.readlines()
-            for line in lines:
-                if line.startswith("PRETTY_NAME="):
-                    os_name = line.split("=", 1)[1].strip().strip('"')
-                    logger.debug("OS release from os-release: %s", os_name)
-                    return os_name
-
-        # Fallback to platform info
+                data = f.read()
+            _, sep, rest = data.partition("PRETTY_NAME=")
+            if sep:
+                # The value may be quoted or bare per os-release(5)
+                os_name = rest.split("\n", 1)[0].strip().strip('"')
+                logger.debug("OS release from os-release: %s", os_name)
+                return os_name
+
+        # Fallback to platform info. Imported lazily: the module pulls in
+        # a sizeable graph and this branch is rare on a Pi.
+        import platform
+
         platform_info = platform.platform()
         logger.debug("OS release from platform: %s", platform_info)
         return platform_info
@@ -183,6 +348,8 @@ def get_os_release() -> str:
     except FileNotFoundError:
         logger.warning("OS release file not found, using platform fallback")
         try:
+            import platform
+
             platform_info = platform.platform()
             logger.info("OS release will be reported as: %s", platform_info)
             return platform_info
@@ -197,20 +364,50 @@ def get_os_release() -> str:
 
 
 # ---------- logging ----------
+# Skip the per-record thread/process/multiprocessing lookups inside
+# LogRecord creation; none of them appear in our log format.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+
+class _DeferredRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating handler that only stats the log file every 64th emit."""
+
+    _CHECK_EVERY = 64
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._emit_count = 0
+
+    def shouldRollover(self, record: logging.LogRecord) -> int:
+        self._emit_count += 1
+        if self._emit_count % self._CHECK_EVERY:
+            return 0
+        return super().shouldRollover(record)
+
+
 logger = logging.getLogger(APP_NAME)
 logger.setLevel(logging.INFO)
 fmt = logging.Formatter("%(asctime)s %(levelname)s %(message)s", "%Y-%m-%d %H:%M:%S")
-handlers: List[logging.Handler] = [logging.StreamHandler()]
+# Under systemd, journald stamps every record itself; skip the strftime
+# per emit and the duplicated timestamp. Interactive runs keep it.
+if sys.stderr.isatty():
+    stream_fmt = fmt
+else:
+    stream_fmt = logging.Formatter("%(levelname)s %(message)s")
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(stream_fmt)
+handlers: List[logging.Handler] = [stream_handler]
 if LOG_TO_FILE:
     try:
-        fh = logging.FileHandler(LOG_PATH)
+        fh = _DeferredRotatingFileHandler(LOG_PATH, maxBytes=5 * 1024 * 1024, backupCount=2)
         fh.setFormatter(fmt)
         handlers.append(fh)
     except Exception:
         pass
+logger.handlers = []
 for h in handlers:
-    h.setFormatter(fmt)
-    logger.handlers = []
     logger.addHandler(h)
 # ----------------------------
 
@@ -254,7 +451,10 @@ def disc_payload(
     cfg = {
         "name": name,
         "uniq_id": f"{device_id}_{topic_tail.replace('/', '_')}",
-        "state_topic": f"{root}/{topic_tail}",
+        # All sensors read from the aggregated state bundle so the agent
+        # publishes one message per tick instead of one per topic.
+        "state_topic": state_t,
+        "value_template": f"{{{{ value_json['{topic_tail}'] }}}}",
         "availability_topic": avail_t,
         "device": DEVICE_INFO,
     }
@@ -269,19 +469,22 @@ def disc_payload(
     return cfg
 
 
-def publish_discovery(c: mqtt.Client) -> None:
+# Discovery configs are static for the lifetime of the process, so they are
+# serialized once and replayed on every (re)connect.
+_discovery_cache: Optional[List] = None
+
+
+def _build_discovery_cache() -> List:
+    """Build the (topic, serialized payload) list for all discovery configs."""
+    cache: List = []
+
     # sensors
     for tail, (name, unit, devcls) in SENSORS.items():
         obj = tail.replace("/", "_")
         topic = f"{MQTT_DISCOVERY_PREFIX}/sensor/{device_id}/{obj}/config"
         # For text sensors (no unit), don't set state_class
         state_class = None if unit is None else "measurement"
-        c.publish(
-            topic,
-            json.dumps(disc_payload(tail, name, unit, devcls, state_class)),
-            qos=1,
-            retain=True,
-        )
+        cache.append((topic, _json_dumps(disc_payload(tail, name, unit, devcls, state_class))))
 
     # controls: simple button commands
     def button(topic_key: str, name: str, icon: str) -> None:
@@ -295,7 +498,7 @@ def publish_discovery(c: mqtt.Client) -> None:
             "icon": icon,
         }
         topic = f"{MQTT_DISCOVERY_PREFIX}/button/{device_id}/{topic_key}/config"
-        c.publish(topic, json.dumps(cfg), qos=1, retain=True)
+        cache.append((topic, _json_dumps(cfg)))
 
     button("reboot", "Reboot Enviro Zero", "mdi:restart")
     button("shutdown", "Shutdown Enviro Zero", "mdi:power")
@@ -320,23 +523,41 @@ def publish_discovery(c: mqtt.Client) -> None:
             "mode": "box",
         }
         topic = f"{MQTT_DISCOVERY_PREFIX}/number/{device_id}/{key}/config"
-        c.publish(topic, json.dumps(cfg), qos=1, retain=True)
+        cache.append((topic, _json_dumps(cfg)))
 
     number("Temp Offset", "temp_offset", "°C", -10, 10, 0.1)
     number("Humidity Offset", "hum_offset", "%", -20, 20, 0.5)
     number("CPU Temp Factor", "cpu_temp_factor", None, 0.5, 5.0, 0.1)
     number("CPU Temp Smoothing", "cpu_temp_smoothing", None, 0.01, 1.0, 0.01)
 
+    return cache
+
+
+def publish_discovery(c: mqtt.Client) -> None:
+    global _discovery_cache
+    if _discovery_cache is None:
+        _discovery_cache = _build_discovery_cache()
+    for topic, payload in _discovery_cache:
+        c.publish(topic, payload, qos=1, retain=True)
 
-def read_all(enviro_sensors: EnviroPlusSensors) -> Dict[str, Any]:
-    """Read all sensor and system data using the EnviroPlusSensors class."""
-    # Get sensor data from the encapsulated sensor manager
-    sensor_data = enviro_sensors.get_all_sensor_data()
 
-    # Get system metrics
-    mem = psutil.virtual_memory()
+# Host info changes at minute scale (or never), so the main loop only
+# collects it every Nth poll cycle instead of every tick. Overridable
+# for installs that want a different metadata cadence; clamped so
+# META_EVERY=0 means "every tick" instead of a ZeroDivisionError.
+HOST_INFO_EVERY_N_TICKS = max(1, int(os.getenv("META_EVERY", "15")))
+
+# How often the state bundle is republished retained so a reconnecting
+# Home Assistant picks up the latest snapshot; per-tick diffs between
+# snapshots go out unretained.
+STATE_SNAPSHOT_SEC = 60.0
+
+
+def read_sensors(enviro_sensors: EnviroPlusSensors) -> Dict[str, Any]:
+    """Read fast-changing sensor and system values (collected every tick)."""
+    sensor_data = enviro_sensors.get_all_sensor_data()
 
-    vals = {
+    return {
         # Sensor data (processed)
         "bme280/temperature": sensor_data["temperature"],
         "bme280/humidity": sensor_data["humidity"],
@@ -345,20 +566,93 @@ def read_all(enviro_sensors: EnviroPlusSensors) -> Dict[str, Any]:
         "gas/oxidising": sensor_data["gas_oxidising"],
         "gas/reducing": sensor_data["gas_reducing"],
         "gas/nh3": sensor_data["gas_nh3"],
-        # System metrics
+        # Fast-changing system metrics
         "host/cpu_temp": round(enviro_sensors.cpu_temp(), 1),
-        "host/cpu_usage": round(psutil.cpu_percent(interval=None), 1),
-        "host/mem_usage": round(mem.percent, 1),
-        "host/mem_size": round(mem.total / 1024 / 1024 / 1024, 3),
+        "host/cpu_usage": round(_read_cpu_percent(), 1),
+        "host/mem_usage": round(_read_mem_percent(), 1),
+        # strftime over gmtime is one C call; datetime.now(utc).isoformat()
+        # builds a datetime and does tz math for the same string
+        _LAST_UPDATE_KEY: time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def read_host_info() -> Dict[str, Any]:
+    """Read slow-changing host values (collected every Nth tick)."""
+    return {
+        "host/mem_size": round(_read_mem_size_gb(), 3),
         "host/uptime": get_uptime_seconds(),
         "host/hostname": str(hostname),
         "host/network": get_ipv4_prefer_wlan0(),
         "host/os_release": get_os_release(),
-        "meta/last_update": datetime.now(timezone.utc).isoformat(),
     }
+
+
+def read_all(enviro_sensors: EnviroPlusSensors) -> Dict[str, Any]:
+    """Read all sensor and system data using the EnviroPlusSensors class."""
+    vals = read_sensors(enviro_sensors)
+    vals.update(read_host_info())
     return vals
 
 
+# Key under which the last retained snapshot payload is tracked in the
+# last_published cache (distinct from the per-tick diff entry).
+_SNAPSHOT_CACHE_KEY = "snapshot"
+
+# The per-tick timestamp advances every poll, so it is excluded from the
+# change comparison in publish_state; comparing it would make every
+# bundle look different and defeat the dedup entirely.
+_LAST_UPDATE_KEY = "meta/last_update"
+
+# MQTTv5 message expiry on state publishes lets the broker age out a
+# stale retained snapshot instead of holding it forever after the
+# device goes away. One Properties object, reused for every publish.
+_STATE_PROPS = Properties(PacketTypes.PUBLISH)
+_STATE_PROPS.MessageExpiryInterval = 3600
+
+
+def publish_state(
+    client: mqtt.Client,
+    state: Dict[str, Any],
+    last_published: Dict[str, bytes],
+    snapshot: bool = False,
+) -> None:
+    """
+    Publish the aggregated state bundle, skipping identical payloads.
+
+    Bundling all values into one JSON message per tick replaces 15+
+    separate publishes (each a paho enqueue plus a network write) with a
+    single one; unchanged bundles are not resent at all.
+
+    Per-tick publishes go out unretained: retaining every tick forces
+    the broker to persist each message. A periodic snapshot publish
+    (snapshot=True) is retained instead, so a reconnecting Home
+    Assistant still sees the latest bundle; it is skipped only when the
+    broker's retained copy is already current.
+
+    Args:
+        client: MQTT client to publish with
+        state: Mapping of topic tail to current value
+        last_published: Cache of the last payloads sent (updated in place)
+        snapshot: Publish retained, refreshing the broker's copy
+    """
+    # Compare without the timestamp: it changes every tick, and a bundle
+    # whose only difference is meta/last_update carries no new data.
+    cmp_payload = _json_dumps({k: v for k, v in state.items() if k != _LAST_UPDATE_KEY})
+    if snapshot:
+        if last_published.get(_SNAPSHOT_CACHE_KEY) == cmp_payload:
+            return
+        client.publish(state_t, _json_dumps(state), qos=0, retain=True, properties=_STATE_PROPS)
+        last_published[_SNAPSHOT_CACHE_KEY] = cmp_payload
+        last_published[state_t] = cmp_payload
+        return
+    if last_published.get(state_t) == cmp_payload:
+        return
+    # Explicit QoS 0: telemetry at poll cadence tolerates loss, and
+    # fire-and-forget skips the PUBACK round trip per message.
+    client.publish(state_t, _json_dumps(state), qos=0, properties=_STATE_PROPS)
+    last_published[state_t] = cmp_payload
+
+
 def on_connect(
     client: mqtt.Client, userdata: Any, flags: Any, rc: int, properties: Any = None
 ) -> None:
@@ -396,48 +690,84 @@ def on_connect(
     client.subscribe([(cmd_t, 1), (set_t, 1)])
 
 
+# Pre-built argv tuples for system commands; spawned in a new session so
+# the child is detached from the agent's process group.
+CMD_REBOOT = ("sudo", "reboot")
+CMD_SHUTDOWN = ("sudo", "shutdown", "-h", "now")
+CMD_RESTART_SERVICE = ("sudo", "systemctl", "restart", f"{APP_NAME}.service")
+
+
+def _cmd_reboot(client: mqtt.Client, settings_manager: Optional[SettingsManager]) -> None:
+    """Reboot the host."""
+    logger.info("Command: reboot")
+    client.publish(avail_t, "offline", retain=True)
+    subprocess.Popen(CMD_REBOOT, start_new_session=True)
+
+
+def _cmd_shutdown(client: mqtt.Client, settings_manager: Optional[SettingsManager]) -> None:
+    """Shut the host down."""
+    logger.info("Command: shutdown")
+    client.publish(avail_t, "offline", retain=True)
+    subprocess.Popen(CMD_SHUTDOWN, start_new_session=True)
+
+
+def _cmd_restart_service(client: mqtt.Client, settings_manager: Optional[SettingsManager]) -> None:
+    """Restart the agent's systemd service."""
+    logger.info("Command: restart service")
+    subprocess.Popen(CMD_RESTART_SERVICE, start_new_session=True)
+
+
+def _cmd_reset_settings(client: mqtt.Client, settings_manager: Optional[SettingsManager]) -> None:
+    """Reset persistent settings to defaults and republish the setters."""
+    logger.info("Command: reset settings to defaults")
+    if not settings_manager:
+        logger.error("Settings manager not available for reset")
+        return
+    try:
+        settings_manager.reset_to_defaults()
+        # Publish the reset values to MQTT
+        client.publish(
+            f"{root}/set/temp_offset", str(settings_manager.get_temp_offset()), retain=True
+        )
+        client.publish(
+            f"{root}/set/hum_offset", str(settings_manager.get_hum_offset()), retain=True
+        )
+        client.publish(
+            f"{root}/set/cpu_temp_factor",
+            str(settings_manager.get_cpu_temp_factor()),
+            retain=True,
+        )
+        client.publish(
+            f"{root}/set/cpu_temp_smoothing",
+            str(settings_manager.get_cpu_temp_smoothing()),
+            retain=True,
+        )
+        logger.info("Settings reset successfully")
+    except Exception as e:
+        logger.error("Failed to reset settings: %s", e)
+
+
+# Command payloads dispatched by table lookup rather than an if/elif
+# chain; unknown payloads fall through silently as before.
+_COMMAND_HANDLERS = {
+    "reboot": _cmd_reboot,
+    "shutdown": _cmd_shutdown,
+    "restart_service": _cmd_restart_service,
+    "reset_settings": _cmd_reset_settings,
+}
+
+# Calibration topic leaves; each doubles as the EnviroPlusSensors
+# update_calibration kwarg and the SettingsManager setter suffix.
+_CALIBRATION_KEYS = ("temp_offset", "hum_offset", "cpu_temp_factor", "cpu_temp_smoothing")
+
+
 def _handle_command(
     client: mqtt.Client, payload: str, settings_manager: Optional[SettingsManager] = None
 ) -> None:
     """Handle system commands."""
-    if payload == "reboot":
-        logger.info("Command: reboot")
-        client.publish(avail_t, "offline", retain=True)
-        subprocess.Popen(["sudo", "reboot"])
-    elif payload == "shutdown":
-        logger.info("Command: shutdown")
-        client.publish(avail_t, "offline", retain=True)
-        subprocess.Popen(["sudo", "shutdown", "-h", "now"])
-    elif payload == "restart_service":
-        logger.info("Command: restart service")
-        subprocess.Popen(["sudo", "systemctl", "restart", f"{APP_NAME}.service"])
-    elif payload == "reset_settings":
-        logger.info("Command: reset settings to defaults")
-        if settings_manager:
-            try:
-                settings_manager.reset_to_defaults()
-                # Publish the reset values to MQTT
-                client.publish(
-                    f"{root}/set/temp_offset", str(settings_manager.get_temp_offset()), retain=True
-                )
-                client.publish(
-                    f"{root}/set/hum_offset", str(settings_manager.get_hum_offset()), retain=True
-                )
-                client.publish(
-                    f"{root}/set/cpu_temp_factor",
-                    str(settings_manager.get_cpu_temp_factor()),
-                    retain=True,
-                )
-                client.publish(
-                    f"{root}/set/cpu_temp_smoothing",
-                    str(settings_manager.get_cpu_temp_smoothing()),
-                    retain=True,
-                )
-                logger.info("Settings reset successfully")
-            except Exception as e:
-                logger.error("Failed to reset settings: %s", e)
-        else:
-            logger.error("Settings manager not available for reset")
+    handler = _COMMAND_HANDLERS.get(payload)
+    if handler is not None:
+        handler(client, settings_manager)
 
 
 def _handle_calibration_setting(
@@ -447,31 +777,16 @@ def _handle_calibration_setting(
     settings_manager: Optional[SettingsManager] = None,
 ) -> None:
     """Handle calibration setting updates."""
-    key = topic.split("/")[-1]
+    key = topic.rpartition("/")[2]
+    if key not in _CALIBRATION_KEYS:
+        logger.warning("Unknown calibration setting: %s", key)
+        return
 
     try:
-        if key == "temp_offset":
-            value = float(payload)
-            enviro_sensors.update_calibration(temp_offset=value)
-            if settings_manager:
-                settings_manager.set_temp_offset(value)
-        elif key == "hum_offset":
-            value = float(payload)
-            enviro_sensors.update_calibration(hum_offset=value)
-            if settings_manager:
-                settings_manager.set_hum_offset(value)
-        elif key == "cpu_temp_factor":
-            value = float(payload)
-            enviro_sensors.update_calibration(cpu_temp_factor=value)
-            if settings_manager:
-                settings_manager.set_cpu_temp_factor(value)
-        elif key == "cpu_temp_smoothing":
-            value = float(payload)
-            enviro_sensors.update_calibration(cpu_temp_smoothing=value)
-            if settings_manager:
-                settings_manager.set_cpu_temp_smoothing(value)
-        else:
-            logger.warning("Unknown calibration setting: %s", key)
+        value = float(payload)
+        enviro_sensors.update_calibration(**{key: value})
+        if settings_manager:
+            getattr(settings_manager, f"set_{key}")(value)
     except ValueError:
         logger.error("Invalid value for %s: %s", key, payload)
     except Exception as e:
@@ -497,6 +812,45 @@ def on_message(
         logger.exception("on_message error: %s", e)
 
 
+def _apply_process_tuning() -> None:
+    """
+    Apply optional CPU pinning and niceness from PIN_CPU / NICE.
+
+    Pinning the agent to one core and raising its priority keeps the
+    poll cadence stable against scheduler jitter. A negative NICE needs
+    root or CAP_SYS_NICE (the packaged unit runs as root).
+
+    Raises:
+        Never raises - failures are logged and ignored
+    """
+    if PIN_CPU:
+        try:
+            os.sched_setaffinity(0, {int(PIN_CPU)})
+            logger.info("Pinned to CPU %s", PIN_CPU)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not pin to CPU %s: %s", PIN_CPU, e)
+    if NICE:
+        try:
+            os.nice(int(NICE))
+            logger.info("Adjusted niceness by %s", NICE)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not adjust niceness by %s: %s", NICE, e)
+
+
+def _on_socket_open(client: mqtt.Client, userdata: Any, sock: Any) -> None:
+    """
+    Disable Nagle's algorithm on the broker connection.
+
+    The agent sends many small packets; without TCP_NODELAY the kernel
+    can hold them back waiting for ACKs. Registered as paho's
+    on_socket_open hook so it re-applies after reconnects.
+    """
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (OSError, AttributeError) as e:
+        logger.debug("Could not set TCP_NODELAY: %s", e)
+
+
 def validate_config() -> None:
     """
     Validate required configuration on startup.
@@ -572,12 +926,51 @@ def signal_handler(signum: int, frame: Any, client: Optional[mqtt.Client] = None
         sys.exit(0)
 
 
+async def _poll_loop(client: mqtt.Client, enviro_sensors: EnviroPlusSensors) -> None:
+    """
+    Drive the publish cadence on an asyncio event loop.
+
+    Blocking sensor and host reads run in the default executor, so the
+    I²C transactions overlap with paho's network thread instead of
+    serialising behind a sleeping main thread.
+    """
+    loop = asyncio.get_running_loop()
+    snapshot_every = max(1, int(STATE_SNAPSHOT_SEC / POLL_SEC))
+    tick = 0
+    state: Dict[str, Any] = {}
+    last_published: Dict[str, bytes] = {}
+    # Monotonic deadline scheduling: sleeping for the remainder of each
+    # period (rather than a fixed POLL_SEC after the work) keeps the
+    # cadence at exactly POLL_SEC with no cumulative drift.
+    next_t = loop.time()
+    while True:
+        state.update(await loop.run_in_executor(None, read_sensors, enviro_sensors))
+        if tick % HOST_INFO_EVERY_N_TICKS == 0:
+            state.update(await loop.run_in_executor(None, read_host_info))
+        publish_state(client, state, last_published, snapshot=tick % snapshot_every == 0)
+        tick += 1
+        next_t += POLL_SEC
+        delay = next_t - loop.time()
+        if delay <= 0:
+            # Missed the deadline (slow tick); resync instead of racing
+            next_t = loop.time()
+            delay = 0.0
+        await asyncio.sleep(delay)
+
+
 def main() -> None:
     logger.info("%s starting (v%s)", APP_NAME, VERSION)
 
     # Validate configuration before proceeding
     validate_config()
 
+    # Optional CPU pinning / niceness tuning
+    _apply_process_tuning()
+
+    # Seed the /proc/stat baseline: the first delta-based reading returns
+    # 0.0, so take it now rather than publishing it on the first tick.
+    _read_cpu_percent()
+
     logger.info("Root topic: %s", root)
     logger.info("Discovery prefix: %s", MQTT_DISCOVERY_PREFIX)
     logger.info("Poll interval: %ss", POLL_SEC)
@@ -612,6 +1005,10 @@ def main() -> None:
     if MQTT_USER:
         client.username_pw_set(MQTT_USER, MQTT_PASS)
     client.will_set(avail_t, "offline", retain=True)
+    # Widen paho's 20-message inflight window so QoS 1 discovery bursts
+    # don't stall, and let the queue grow unbounded rather than drop.
+    client.max_inflight_messages_set(100)
+    client.max_queued_messages_set(0)
 
     # Set userdata to pass settings manager to callbacks
     client.user_data_set({"settings_manager": settings_manager})
@@ -623,6 +1020,7 @@ def main() -> None:
         on_message(client, userdata, msg, enviro_sensors)
 
     client.on_message = message_wrapper
+    client.on_socket_open = _on_socket_open
 
     # Register signal handlers for graceful shutdown
     def sigterm_handler(signum: int, frame: Any) -> None:
@@ -634,22 +1032,22 @@ def main() -> None:
     signal.signal(signal.SIGTERM, sigterm_handler)
     signal.signal(signal.SIGINT, sigint_handler)
 
-    client.connect(MQTT_HOST, MQTT_PORT, keepalive=60)
+    # Non-blocking connect: the network thread completes it, so a slow
+    # DNS lookup or an HA broker that is still booting doesn't stall
+    # sensor polling. Queued publishes flush once the connect lands.
+    client.connect_async(MQTT_HOST, MQTT_PORT, keepalive=60)
     client.loop_start()
 
-    # Publish static device attributes once
+    # Publish static device attributes once; qos=1 so paho queues it if
+    # the broker connection hasn't completed yet.
     static = {
         "model": get_model(),
         "serial": get_serial(),
     }
-    client.publish(f"{root}/device/attributes", json.dumps(static), retain=True)
+    client.publish(f"{root}/device/attributes", _json_dumps(static), qos=1, retain=True)
 
     try:
-        while True:
-            vals = read_all(enviro_sensors)
-            for tail, val in vals.items():
-                client.publish(f"{root}/{tail}", str(val), retain=True)
-            time.sleep(POLL_SEC)
+        asyncio.run(_poll_loop(client, enviro_sensors))
     except KeyboardInterrupt:
         logger.info("Received KeyboardInterrupt, shutting down gracefully")
         signal_handler(signal.SIGINT, None, client)
@@ -6,11 +6,20 @@ This module provides a clean interface for reading and processing data from
 Pimoroni Enviro+ sensors with proper separation of concerns.
 """
 
-import subprocess
 import logging
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 
+# Kernel thermal zone file exposing the CPU temperature in millidegrees C
+CPU_TEMP_PATH = "/sys/class/thermal/thermal_zone0/temp"
+
+# Shared pool for overlapping the LTR559 and gas ADC reads with the BME280
+# transactions. The kernel serialises the smbus ioctls on the bus, so the
+# workers only overlap the blocking waits, not the transfers themselves.
+_I2C_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="enviro-i2c")
+
 # Hardware imports with fallback for testing
 try:
     from bme280 import BME280
@@ -64,6 +73,10 @@ class EnviroPlusSensors:
         self._cpu_temp_smoothed = 40.6
         self._cpu_temp_last_update = 0.0
 
+        # Cached descriptor for the thermal zone file; opened lazily and
+        # re-read with pread so each poll skips the open/close syscalls
+        self._cpu_temp_fd: Optional[int] = None
+
         # Initialize sensor hardware
         try:
             if HARDWARE_AVAILABLE:
@@ -79,33 +92,46 @@ class EnviroPlusSensors:
             self.logger.error("Failed to initialize Enviro+ sensors: %s", e)
             raise
 
+    def _close_cpu_temp_fd(self) -> None:
+        """Close the cached thermal zone descriptor so the next read reopens it."""
+        if self._cpu_temp_fd is not None:
+            try:
+                os.close(self._cpu_temp_fd)
+            except OSError:
+                pass
+            self._cpu_temp_fd = None
+
     def _read_cpu_temp(self) -> float:
         """
-        Read CPU temperature using vcgencmd.
+        Read CPU temperature from the kernel thermal zone sysfs file.
+
+        Reading sysfs directly avoids forking a vcgencmd subprocess on
+        every poll cycle; the descriptor is opened once and re-read with
+        pread, so steady-state polls cost a single syscall.
 
         Returns:
             CPU temperature in °C
 
         Raises:
-            subprocess.CalledProcessError: If vcgencmd command fails
-            ValueError: If temperature parsing fails
-            Exception: For any other unexpected error
+            OSError: If the thermal zone file cannot be read
+            ValueError: If the temperature value cannot be parsed
         """
+        raw = b""
         try:
-            out = subprocess.check_output(["vcgencmd", "measure_temp"], text=True).strip()
-            # Parse output: temp=42.0'C
-            temp_str = out.split("=")[1].split("'")[0]
-            temp_value = float(temp_str)
-            self.logger.debug("CPU temperature: %.1f°C", temp_value)
+            if self._cpu_temp_fd is None:
+                self._cpu_temp_fd = os.open(CPU_TEMP_PATH, os.O_RDONLY)
+            raw = os.pread(self._cpu_temp_fd, 16, 0)
+            # File contains the temperature in millidegrees, e.g. 42000
+            temp_value = int(raw) / 1000.0
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("CPU temperature: %.1f°C", temp_value)
             return temp_value
-        except subprocess.CalledProcessError as e:
-            self.logger.error("vcgencmd command failed (exit code %d): %s", e.returncode, e)
-            raise
-        except (ValueError, IndexError) as e:
-            self.logger.error("Failed to parse CPU temperature from output '%s': %s", str(out), e)
+        except OSError as e:
+            self._close_cpu_temp_fd()
+            self.logger.error("Failed to read CPU temperature from %s: %s", CPU_TEMP_PATH, e)
             raise
-        except Exception as e:
-            self.logger.error("Unexpected error reading CPU temperature: %s", e)
+        except ValueError as e:
+            self.logger.error("Failed to parse CPU temperature from %r: %s", raw, e)
             raise
 
     def _get_smoothed_cpu_temp(self) -> float:
@@ -142,12 +168,13 @@ class EnviroPlusSensors:
             )
             self._cpu_temp_last_update = current_time
 
-            self.logger.debug(
-                "CPU temperature smoothing: raw=%.1f°C, smoothed=%.1f°C, factor=%.2f",
-                raw_cpu_temp,
-                self._cpu_temp_smoothed,
-                self.cpu_temp_smoothing,
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "CPU temperature smoothing: raw=%.1f°C, smoothed=%.1f°C, factor=%.2f",
+                    raw_cpu_temp,
+                    self._cpu_temp_smoothed,
+                    self.cpu_temp_smoothing,
+                )
 
             return self._cpu_temp_smoothed
         except Exception as e:
@@ -200,12 +227,13 @@ class EnviroPlusSensors:
 
             # Apply Pimoroni compensation formula: raw_temp - ((cpu_temp - raw_temp) / factor)
             compensated_temp = raw_temp - ((cpu_temp - raw_temp) / self.cpu_temp_factor)
-            self.logger.debug(
-                "Temperature compensation: raw=%.1f°C, cpu_smoothed=%.1f°C, compensated=%.1f°C",
-                raw_temp,
-                cpu_temp,
-                compensated_temp,
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "Temperature compensation: raw=%.1f°C, cpu_smoothed=%.1f°C, compensated=%.1f°C",
+                    raw_temp,
+                    cpu_temp,
+                    compensated_temp,
+                )
             return compensated_temp
         except Exception as e:
             self.logger.warning("CPU temperature compensation failed: %s", e)
@@ -224,7 +252,7 @@ class EnviroPlusSensors:
             Never raises - always returns a fallback value
         """
         try:
-            raw_temp = self.bme280.get_temperature()
+            raw_temp = float(self.bme280.get_temperature())
             compensated_temp = self._apply_temp_compensation(raw_temp)
             final_temp = round(compensated_temp + self.temp_offset, 2)
             self.logger.debug(
@@ -250,8 +278,8 @@ class EnviroPlusSensors:
             Never raises - always returns a fallback value
         """
         try:
-            raw_temp = self.bme280.get_temperature()
-            return round(float(raw_temp), 2)
+            raw_temp = float(self.bme280.get_temperature())
+            return round(raw_temp, 2)
         except Exception as e:
             self.logger.error("Failed to read raw temperature: %s", e)
             self.logger.info("Raw temperature will be reported as 0.0°C")
@@ -453,47 +481,120 @@ class EnviroPlusSensors:
             cpu_temp_factor: New CPU temperature compensation factor
             cpu_temp_smoothing: New CPU temperature smoothing factor (0.0-1.0)
         """
+        changes = []
         if temp_offset is not None:
             self.temp_offset = temp_offset
-            self.logger.info("Updated temperature offset to %s°C", temp_offset)
+            changes.append(f"temp_offset={temp_offset}°C")
 
         if hum_offset is not None:
             self.hum_offset = hum_offset
-            self.logger.info("Updated humidity offset to %s%%", hum_offset)
+            changes.append(f"hum_offset={hum_offset}%")
 
         if cpu_temp_factor is not None:
             self.cpu_temp_factor = cpu_temp_factor
-            self.logger.info("Updated CPU temperature factor to %s", cpu_temp_factor)
+            changes.append(f"cpu_temp_factor={cpu_temp_factor}")
 
         if cpu_temp_smoothing is not None:
             self.cpu_temp_smoothing = cpu_temp_smoothing
-            self.logger.info("Updated CPU temperature smoothing to %s", cpu_temp_smoothing)
+            changes.append(f"cpu_temp_smoothing={cpu_temp_smoothing}")
+
+        if changes:
+            self.logger.info("Calibration updated: %s", ", ".join(changes))
+
+    def _read_bme280_values(self) -> Dict[str, Any]:
+        """
+        Read the BME280 temperature/humidity/pressure group.
+
+        Each chip register is read once per poll; the processed and raw
+        variants of each metric are derived from the same sample instead
+        of issuing a second I²C transaction per pair.
+        """
+        data: Dict[str, Any] = {}
+        try:
+            raw_temp = float(self.bme280.get_temperature())
+            compensated_temp = self._apply_temp_compensation(raw_temp)
+            data["temperature"] = round(compensated_temp + self.temp_offset, 2)
+            data["temperature_raw"] = round(raw_temp, 2)
+        except Exception as e:
+            self.logger.error("Failed to read temperature: %s", e)
+            self.logger.info("Temperature will be reported as 0.0°C")
+            data["temperature"] = 0.0
+            data["temperature_raw"] = 0.0
+        try:
+            raw_humidity = float(self.bme280.get_humidity())
+            calibrated_humidity = raw_humidity + self.hum_offset
+            data["humidity"] = round(max(0.0, min(100.0, calibrated_humidity)), 2)
+            data["humidity_raw"] = round(raw_humidity, 2)
+        except Exception as e:
+            self.logger.error("Failed to read humidity: %s", e)
+            self.logger.info("Humidity will be reported as 0.0%")
+            data["humidity"] = 0.0
+            data["humidity_raw"] = 0.0
+        try:
+            raw_pressure = round(float(self.bme280.get_pressure()), 2)
+            data["pressure"] = raw_pressure
+            data["pressure_raw"] = raw_pressure
+        except Exception as e:
+            self.logger.error("Failed to read pressure: %s", e)
+            self.logger.info("Pressure will be reported as 0.0 hPa")
+            data["pressure"] = 0.0
+            data["pressure_raw"] = 0.0
+        return data
+
+    def _read_light_values(self) -> Dict[str, Any]:
+        """Read the LTR559 illuminance group from a single driver call."""
+        try:
+            lux = round(float(self.ltr559.get_lux()), 2)
+        except Exception as e:
+            self.logger.error("Failed to read lux: %s", e)
+            self.logger.info("Lux will be reported as 0.0 lux")
+            lux = 0.0
+        return {
+            "lux": lux,
+            "lux_raw": lux,
+        }
+
+    def _read_gas_values(self) -> Dict[str, Any]:
+        """
+        Read the MICS6814 gas sensor group.
+
+        gas.read_all() runs a full ADC conversion cycle, so it is called
+        once and all six values are derived from that single sample
+        rather than reconverting per accessor.
+        """
+        try:
+            gas_data = gas.read_all()
+            oxidising = float(gas_data.oxidising)
+            reducing = float(gas_data.reducing)
+            nh3 = float(gas_data.nh3)
+        except Exception as e:
+            self.logger.error("Failed to read gas sensor: %s", e)
+            self.logger.info("Gas readings will be reported as 0.0")
+            oxidising = reducing = nh3 = 0.0
+        return {
+            "gas_oxidising": round(oxidising / 1000.0, 2),
+            "gas_oxidising_raw": round(oxidising, 2),
+            "gas_reducing": round(reducing / 1000.0, 2),
+            "gas_reducing_raw": round(reducing, 2),
+            "gas_nh3": round(nh3 / 1000.0, 2),
+            "gas_nh3_raw": round(nh3, 2),
+        }
 
     def get_all_sensor_data(self) -> Dict[str, Any]:
         """
         Get all sensor readings in a structured format.
 
+        The light and gas groups run on the shared executor while the
+        BME280 triplet (which shares chip state and must stay serialised)
+        runs on the calling thread, overlapping the blocking I²C waits.
+
         Returns:
             Dictionary containing all sensor readings
         """
-        return {
-            # Temperature
-            "temperature": self.temp(),
-            "temperature_raw": self.temp_raw(),
-            # Humidity
-            "humidity": self.humidity(),
-            "humidity_raw": self.humidity_raw(),
-            # Pressure
-            "pressure": self.pressure(),
-            "pressure_raw": self.pressure_raw(),
-            # Light
-            "lux": self.lux(),
-            "lux_raw": self.lux_raw(),
-            # Gas sensors
-            "gas_oxidising": self.gas_oxidising(),
-            "gas_oxidising_raw": self.gas_oxidising_raw(),
-            "gas_reducing": self.gas_reducing(),
-            "gas_reducing_raw": self.gas_reducing_raw(),
-            "gas_nh3": self.gas_nh3(),
-            "gas_nh3_raw": self.gas_nh3_raw(),
-        }
+        light_future = _I2C_EXECUTOR.submit(self._read_light_values)
+        gas_future = _I2C_EXECUTOR.submit(self._read_gas_values)
+
+        data = self._read_bme280_values()
+        data.update(light_future.result())
+        data.update(gas_future.result())
+        return data
@@ -146,6 +146,12 @@ class SettingsManager:
             return
 
         old_value = self._settings_cache.get(key)
+        if old_value == value:
+            # Retained MQTT setters replay on every reconnect; skip the
+            # disk write when nothing actually changed
+            self.logger.debug("Setting %s unchanged (%s), skipping save", key, value)
+            return
+
         self._settings_cache[key] = value
 
         self.logger.info("Setting %s changed from %s to %s", key, old_value, value)
@@ -231,6 +231,9 @@ POLL_SEC="${POLL}"
 TEMP_OFFSET="${TEMP_OFFSET}"
 HUM_OFFSET="${HUM_OFFSET}"
 CPU_TEMP_FACTOR="${CPU_TEMP_FACTOR}"
+# Optional scheduler tuning (uncomment to enable):
+#PIN_CPU="3"
+#NICE="-5"
 EOF
   sudo chmod 600 "${CFG}"
 }
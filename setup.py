@@ -21,7 +21,6 @@ setup(
     install_requires=[
         "enviroplus",
         "paho-mqtt>=2.0",
-        "psutil",
     ],
     python_requires=">=3.9",
     entry_points={
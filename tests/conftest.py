@@ -1,6 +1,7 @@
 """Shared pytest fixtures for ha-enviro-plus tests."""
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 # Mock hardware modules at import time
@@ -16,6 +17,23 @@ sys.modules["gpiod"] = MagicMock()
 sys.modules["spidev"] = MagicMock()
 
 
+@pytest.fixture(autouse=True)
+def reset_agent_caches():
+    """Reset agent-level caches so tests stay independent."""
+    from ha_enviro_plus import agent
+
+    agent._ip_cache["val"] = None
+    agent._ip_cache["ts"] = 0.0
+    agent._discovery_cache = None
+    agent._cpu_stat["idle"] = 0
+    agent._cpu_stat["total"] = 0
+    agent._boot_monotonic_ns = None
+    agent.get_model.cache_clear()
+    agent.get_serial.cache_clear()
+    agent.get_os_release.cache_clear()
+    yield
+
+
 @pytest.fixture
 def mock_bme280(mocker):
     """Mock BME280 sensor with realistic data."""
@@ -43,22 +61,45 @@ def mock_gas_sensor(mocker):
     """Mock gas sensor with realistic data."""
     mock = mocker.patch("ha_enviro_plus.sensors.gas.read_all")
 
-    # Create mock gas data object
-    gas_data = Mock()
-    gas_data.oxidising = 50000.0  # 50kΩ
-    gas_data.reducing = 30000.0  # 30kΩ
-    gas_data.nh3 = 40000.0  # 40kΩ
+    # Plain attribute bag; nothing asserts calls on the reading itself
+    gas_data = SimpleNamespace(
+        oxidising=50000.0,  # 50kΩ
+        reducing=30000.0,  # 30kΩ
+        nh3=40000.0,  # 40kΩ
+    )
 
     mock.return_value = gas_data
     return gas_data
 
 
+class _FakeCpuTempFile:
+    """Helper controlling the fake thermal zone file for CPU temperature reads."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def set(self, celsius):
+        """Set the reported CPU temperature in °C."""
+        self.path.write_text(f"{int(celsius * 1000)}\n")
+
+    def write_raw(self, text):
+        """Write raw (possibly malformed) content to the file."""
+        self.path.write_text(text)
+
+    def fail(self):
+        """Break subsequent reads: empty the file (for cached fds) and remove it."""
+        if self.path.exists():
+            self.path.write_text("")
+        self.path.unlink(missing_ok=True)
+
+
 @pytest.fixture
-def mock_subprocess(mocker):
-    """Mock subprocess for CPU temperature reading."""
-    mock = mocker.patch("ha_enviro_plus.sensors.subprocess.check_output")
-    mock.return_value = "temp=42.0'C\n"  # Return string, not bytes
-    return mock
+def mock_cpu_temp(mocker, tmp_path):
+    """Fake sysfs thermal zone file for CPU temperature reading."""
+    temp_file = tmp_path / "thermal_zone0_temp"
+    temp_file.write_text("42000\n")  # 42.0°C
+    mocker.patch("ha_enviro_plus.sensors.CPU_TEMP_PATH", str(temp_file))
+    return _FakeCpuTempFile(temp_file)
 
 
 @pytest.fixture
@@ -69,6 +110,7 @@ def mock_device_id(mocker):
     mocker.patch("ha_enviro_plus.agent.avail_t", "enviro_raspberrypi/status")
     mocker.patch("ha_enviro_plus.agent.cmd_t", "enviro_raspberrypi/cmd")
     mocker.patch("ha_enviro_plus.agent.set_t", "enviro_raspberrypi/set/+")
+    mocker.patch("ha_enviro_plus.agent.state_t", "enviro_raspberrypi/state")
     return "enviro_raspberrypi"
 
 
@@ -91,25 +133,32 @@ def mock_mqtt_client(mocker):
 
 
 @pytest.fixture
-def mock_psutil(mocker):
-    """Mock psutil for system metrics."""
-    mock_vm = mocker.patch("ha_enviro_plus.agent.psutil.virtual_memory")
-    vm = Mock()
-    vm.percent = 45.2
-    vm.total = 8 * 1024 * 1024 * 1024  # 8GB
-    mock_vm.return_value = vm
+def mqtt_client(mock_mqtt_client):
+    """The client instance tests hand directly to agent callbacks."""
+    return mock_mqtt_client
 
-    mock_cpu = mocker.patch("ha_enviro_plus.agent.psutil.cpu_percent")
-    mock_cpu.return_value = 12.5
 
-    return {"vm": vm, "cpu": mock_cpu}
+@pytest.fixture
+def mock_system_metrics(mocker):
+    """Mock the /proc-backed system metric readers."""
+    mock_cpu = mocker.patch("ha_enviro_plus.agent._read_cpu_percent", return_value=12.5)
+    mock_mem_percent = mocker.patch("ha_enviro_plus.agent._read_mem_percent", return_value=45.2)
+    mock_mem_size = mocker.patch("ha_enviro_plus.agent._read_mem_size_gb", return_value=8.0)
+
+    return {"cpu": mock_cpu, "mem_percent": mock_mem_percent, "mem_size": mock_mem_size}
 
 
 @pytest.fixture
 def mock_file_operations(mocker):
     """Mock file operations for system info functions."""
+    real_open = open
 
     def mock_open_side_effect(filename, mode="r", **kwargs):
+        from ha_enviro_plus import sensors as sensors_module
+
+        if str(filename) == sensors_module.CPU_TEMP_PATH:
+            # Let CPU temperature reads hit the fake sysfs file (mock_cpu_temp)
+            return real_open(filename, mode, **kwargs)
         if filename == "/proc/uptime":
             return mocker.mock_open(read_data="12345.67 98765.43")()
         elif filename == "/proc/device-tree/model":
@@ -185,29 +234,6 @@ Serial		: 1234567890abcdef
     }
 
 
-@pytest.fixture
-def mock_network_interfaces(mocker):
-    """Mock network interface detection."""
-    mock_addrs = {
-        "wlan0": [
-            Mock(family=Mock(name="AF_INET"), address="192.168.1.100"),
-            Mock(family=Mock(name="AF_INET6"), address="fe80::1234"),
-        ],
-        "eth0": [Mock(family=Mock(name="AF_INET"), address="10.0.0.5")],
-        "lo": [Mock(family=Mock(name="AF_INET"), address="127.0.0.1")],
-    }
-
-    # Fix the family.name attribute
-    for interface_addrs in mock_addrs.values():
-        for addr in interface_addrs:
-            addr.family.name = "AF_INET"
-
-    mock_psutil = mocker.patch("ha_enviro_plus.agent.psutil.net_if_addrs")
-    mock_psutil.return_value = mock_addrs
-
-    return mock_addrs
-
-
 @pytest.fixture
 def sample_sensor_data():
     """Sample sensor data for testing."""
@@ -292,6 +318,6 @@ def mock_socket(mocker):
 @pytest.fixture
 def mock_platform(mocker):
     """Mock platform operations."""
-    mock_platform = mocker.patch("ha_enviro_plus.agent.platform.platform")
+    mock_platform = mocker.patch("platform.platform")
     mock_platform.return_value = "Linux-5.15.0-rpi4-aarch64-with-glibc2.31"
     return mock_platform
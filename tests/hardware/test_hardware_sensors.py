@@ -346,7 +346,7 @@ class TestHardwarePerformance:
 
     def test_memory_usage(self):
         """Test memory usage with real hardware."""
-        import psutil
+        psutil = pytest.importorskip("psutil")
         import os
 
         # Get initial memory usage
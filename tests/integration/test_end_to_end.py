@@ -5,7 +5,7 @@ import threading
 from unittest.mock import Mock, patch
 from datetime import datetime
 
-from ha_enviro_plus.agent import main, on_message, read_all
+from ha_enviro_plus.agent import main, on_connect, on_message, read_all
 from ha_enviro_plus.sensors import EnviroPlusSensors
 
 
@@ -17,8 +17,8 @@ class TestEndToEndWorkflows:
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
         mock_env_vars,
@@ -31,15 +31,15 @@ class TestEndToEndWorkflows:
         mock_bme280.get_humidity.return_value = 45.0
         mock_bme280.get_pressure.return_value = 1013.25
         mock_ltr559.get_lux.return_value = 150.0
-        mock_subprocess.return_value = "temp=42.0'C\n"
+        mock_cpu_temp.set(42.0)
 
         mock_gas_sensor.oxidising = 50000.0
         mock_gas_sensor.reducing = 30000.0
         mock_gas_sensor.nh3 = 40000.0
 
-        mock_psutil["vm"].percent = 45.2
-        mock_psutil["vm"].total = 8 * 1024 * 1024 * 1024
-        mock_psutil["cpu"].return_value = 12.5
+        mock_system_metrics["mem_percent"].return_value = 45.2
+        mock_system_metrics["mem_size"].return_value = 8.0
+        mock_system_metrics["cpu"].return_value = 12.5
 
         # Mock MQTT client
         mock_client = Mock()
@@ -85,9 +85,15 @@ class TestEndToEndWorkflows:
                     mock_sensors.cpu_temp.return_value = 42.0
 
                     # Mock the main loop to run once
-                    with patch("ha_enviro_plus.agent.time.sleep") as mock_sleep:
+                    sleep_calls = {"count": 0}
+
+                    async def fake_sleep(seconds):
                         # Let the first sleep pass, then interrupt on the second
-                        mock_sleep.side_effect = [None, KeyboardInterrupt()]
+                        sleep_calls["count"] += 1
+                        if sleep_calls["count"] >= 2:
+                            raise KeyboardInterrupt()
+
+                    with patch("ha_enviro_plus.agent.asyncio.sleep", side_effect=fake_sleep):
 
                         # Run main function - expect SystemExit from graceful shutdown
                         with pytest.raises(SystemExit) as exc_info:
@@ -95,14 +101,12 @@ class TestEndToEndWorkflows:
                         assert exc_info.value.code == 0  # Successful shutdown
 
                         # Manually trigger on_connect to simulate connection
-                        from ha_enviro_plus.agent import on_connect
-
                         on_connect(mock_client, None, None, 0)
 
         # Verify MQTT client was configured (no auth by default)
         # mock_client.username_pw_set.assert_called_once_with("testuser", "testpass")
         mock_client.will_set.assert_called_once()
-        mock_client.connect.assert_called_once_with("homeassistant.local", 1883, keepalive=60)
+        mock_client.connect_async.assert_called_once_with("homeassistant.local", 1883, keepalive=60)
         mock_client.loop_start.assert_called_once()
         # loop_stop may be called twice due to finally block, but should be called at least once
         assert mock_client.loop_stop.call_count >= 1
@@ -134,8 +138,8 @@ class TestEndToEndWorkflows:
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
         mock_env_vars,
@@ -181,8 +185,8 @@ class TestEndToEndWorkflows:
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
         mock_env_vars,
@@ -204,7 +208,7 @@ class TestEndToEndWorkflows:
             on_message(mock_client, None, mock_msg, sensors)
 
             # Verify reboot command was executed
-            mock_popen.assert_called_once_with(["sudo", "reboot"])
+            mock_popen.assert_called_once_with(("sudo", "reboot"), start_new_session=True)
 
             # Verify offline status was published
             offline_calls = [
@@ -219,7 +223,9 @@ class TestEndToEndWorkflows:
             on_message(mock_client, None, mock_msg, sensors)
 
             # Verify shutdown command was executed
-            mock_popen.assert_called_once_with(["sudo", "shutdown", "-h", "now"])
+            mock_popen.assert_called_once_with(
+                ("sudo", "shutdown", "-h", "now"), start_new_session=True
+            )
 
         # Test restart service command
         mock_msg.payload.decode.return_value = "restart_service"
@@ -229,7 +235,8 @@ class TestEndToEndWorkflows:
 
             # Verify restart service command was executed
             mock_popen.assert_called_once_with(
-                ["sudo", "systemctl", "restart", "ha-enviro-plus.service"]
+                ("sudo", "systemctl", "restart", "ha-enviro-plus.service"),
+                start_new_session=True,
             )
 
     def test_error_recovery_workflow(
@@ -237,8 +244,8 @@ class TestEndToEndWorkflows:
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
         mock_env_vars,
@@ -255,12 +262,12 @@ class TestEndToEndWorkflows:
                 EnviroPlusSensors()
 
         # Test CPU temperature reading failure
-        mock_subprocess.side_effect = Exception("Command failed")
+        mock_cpu_temp.fail()
 
         sensors = EnviroPlusSensors()
 
         # Should raise exception when CPU temp reading fails
-        with pytest.raises(Exception, match="Command failed"):
+        with pytest.raises(OSError):
             sensors._read_cpu_temp()
 
         # Test temperature compensation with CPU failure
@@ -275,8 +282,8 @@ class TestEndToEndWorkflows:
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
         mock_env_vars,
@@ -289,15 +296,15 @@ class TestEndToEndWorkflows:
         mock_bme280.get_humidity.return_value = 45.0
         mock_bme280.get_pressure.return_value = 1013.25
         mock_ltr559.get_lux.return_value = 150.0
-        mock_subprocess.return_value = "temp=42.0'C\n"
+        mock_cpu_temp.set(42.0)
 
         mock_gas_sensor.oxidising = 50000.0
         mock_gas_sensor.reducing = 30000.0
         mock_gas_sensor.nh3 = 40000.0
 
-        mock_psutil["vm"].percent = 45.2
-        mock_psutil["vm"].total = 8 * 1024 * 1024 * 1024
-        mock_psutil["cpu"].return_value = 12.5
+        mock_system_metrics["mem_percent"].return_value = 45.2
+        mock_system_metrics["mem_size"].return_value = 8.0
+        mock_system_metrics["cpu"].return_value = 12.5
 
         # Create sensors instance
         sensors = EnviroPlusSensors(temp_offset=1.0, hum_offset=2.0)
@@ -359,8 +366,8 @@ class TestEndToEndWorkflows:
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
         mock_env_vars,
@@ -397,8 +404,8 @@ class TestEndToEndWorkflows:
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
         mock_env_vars,
@@ -443,8 +450,8 @@ class TestEndToEndWorkflows:
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
         mock_env_vars,
@@ -476,8 +483,8 @@ class TestEndToEndWorkflows:
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
         mock_env_vars,
@@ -504,4 +511,4 @@ class TestEndToEndWorkflows:
             sensors.update_calibration(temp_offset=1.0)
 
             # Verify calibration update was logged
-            mock_logger.info.assert_called_with("Updated temperature offset to %s°C", 1.0)
+            mock_logger.info.assert_called_with("Calibration updated: %s", "temp_offset=1.0°C")
@@ -269,7 +269,7 @@ class TestMQTTIntegration:
             mock_broker.publish("enviro_raspberrypi/cmd", "reboot")
 
             # Should call reboot command
-            mock_popen.assert_called_once_with(["sudo", "reboot"])
+            mock_popen.assert_called_once_with(("sudo", "reboot"), start_new_session=True)
 
     def test_calibration_updates(
         self, mock_client, mock_broker, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
@@ -302,8 +302,8 @@ class TestMQTTIntegration:
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
         mock_device_id,
@@ -314,18 +314,27 @@ class TestMQTTIntegration:
         mock_bme280.get_humidity.return_value = 45.0
         mock_bme280.get_pressure.return_value = 1013.25
         mock_ltr559.get_lux.return_value = 150.0
-        mock_subprocess.return_value = "temp=42.0'C\n"
+        mock_cpu_temp.set(42.0)
 
         mock_gas_sensor.oxidising = 50000.0
         mock_gas_sensor.reducing = 30000.0
         mock_gas_sensor.nh3 = 40000.0
 
-        mock_psutil["vm"].percent = 45.2
-        mock_psutil["vm"].total = 8 * 1024 * 1024 * 1024
-        mock_psutil["cpu"].return_value = 12.5
+        mock_system_metrics["mem_percent"].return_value = 45.2
+        mock_system_metrics["mem_size"].return_value = 8.0
+        mock_system_metrics["cpu"].return_value = 12.5
 
-        # Mock file operations
-        with patch("builtins.open", mock_open(read_data="12345.67 98765.43")):
+        # Mock file operations, letting CPU temperature reads hit the fake sysfs file
+        real_open = open
+
+        def open_side_effect(filename, mode="r", **kwargs):
+            from ha_enviro_plus import sensors as sensors_module
+
+            if str(filename) == sensors_module.CPU_TEMP_PATH:
+                return real_open(filename, mode, **kwargs)
+            return mock_open(read_data="12345.67 98765.43")(filename, mode, **kwargs)
+
+        with patch("builtins.open", side_effect=open_side_effect):
             from ha_enviro_plus.sensors import EnviroPlusSensors
 
             sensors = EnviroPlusSensors()
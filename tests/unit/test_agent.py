@@ -2,7 +2,7 @@
 
 import json
 import pytest
-from unittest.mock import Mock, patch, mock_open
+from unittest.mock import Mock, call, patch, mock_open
 from datetime import datetime
 
 from ha_enviro_plus.agent import (
@@ -14,10 +14,19 @@ from ha_enviro_plus.agent import (
     disc_payload,
     publish_discovery,
     read_all,
+    read_sensors,
+    read_host_info,
+    publish_state,
+    _read_cpu_percent,
+    _read_mem_percent,
+    _read_mem_size_gb,
     on_connect,
     on_message,
+    main,
     _handle_command,
     _handle_calibration_setting,
+    _on_socket_open,
+    _apply_process_tuning,
     DEVICE_INFO,
     SENSORS,
 )
@@ -26,46 +35,46 @@ from ha_enviro_plus.agent import (
 class TestNetworkFunctions:
     """Test network-related utility functions."""
 
-    def test_get_ipv4_prefer_wlan0_wlan0_available(self, mock_network_interfaces):
-        """Test getting IPv4 address with wlan0 preference."""
-        ip = get_ipv4_prefer_wlan0()
-        assert ip == "192.168.1.100"
-
-    def test_get_ipv4_prefer_wlan0_no_wlan0(self, mocker, mock_device_id):
-        """Test getting IPv4 address when wlan0 is not available."""
-        mock_addrs = {
-            "eth0": [Mock(family=Mock(name="AF_INET"), address="10.0.0.5")],
-            "lo": [Mock(family=Mock(name="AF_INET"), address="127.0.0.1")],
-        }
-
-        # Fix the family.name attribute
-        for interface_addrs in mock_addrs.values():
-            for addr in interface_addrs:
-                addr.family.name = "AF_INET"
-
-        mock_psutil = mocker.patch("ha_enviro_plus.agent.psutil.net_if_addrs")
-        mock_psutil.return_value = mock_addrs
-
-        ip = get_ipv4_prefer_wlan0()
-        assert ip == "10.0.0.5"
-
-    def test_get_ipv4_prefer_wlan0_no_non_loopback(self, mocker):
-        """Test getting IPv4 address when only loopback is available."""
-        mock_addrs = {"lo": [Mock(family=Mock(name="AF_INET"), address="127.0.0.1")]}
-
-        mock_psutil = mocker.patch("ha_enviro_plus.agent.psutil.net_if_addrs")
-        mock_psutil.return_value = mock_addrs
-
-        ip = get_ipv4_prefer_wlan0()
-        assert ip == "unknown"
-
-    def test_get_ipv4_prefer_wlan0_exception(self, mocker):
-        """Test getting IPv4 address when exception occurs."""
-        mock_psutil = mocker.patch("ha_enviro_plus.agent.psutil.net_if_addrs")
-        mock_psutil.side_effect = Exception("Network error")
+    @pytest.mark.parametrize(
+        "addrs,nameindex,expected",
+        [
+            pytest.param(
+                {"wlan0": "192.168.1.100", "eth0": "10.0.0.5", "lo": "127.0.0.1"},
+                [(1, "lo"), (2, "wlan0"), (3, "eth0")],
+                "192.168.1.100",
+                id="wlan0-preferred",
+            ),
+            pytest.param(
+                {"eth0": "10.0.0.5", "lo": "127.0.0.1"},
+                [(1, "lo"), (2, "eth0")],
+                "10.0.0.5",
+                id="no-wlan0-falls-back",
+            ),
+            pytest.param(
+                {"lo": "127.0.0.1"},
+                [(1, "lo")],
+                "unknown",
+                id="loopback-only",
+            ),
+            pytest.param(None, [], "unknown", id="lookup-error"),
+        ],
+    )
+    def test_get_ipv4_prefer_wlan0(self, mocker, addrs, nameindex, expected):
+        """Test wlan0-preferred IPv4 lookup across interface layouts."""
+
+        def fake_iface_ipv4(sock, name):
+            if addrs is None:
+                raise Exception("Network error")
+            try:
+                return addrs[name]
+            except KeyError:
+                raise OSError(f"no such interface: {name}")
+
+        mocker.patch("ha_enviro_plus.agent._iface_ipv4", side_effect=fake_iface_ipv4)
+        mocker.patch("ha_enviro_plus.agent.socket.if_nameindex", return_value=nameindex)
 
         ip = get_ipv4_prefer_wlan0()
-        assert ip == "unknown"
+        assert ip == expected
 
 
 class TestSystemInfoFunctions:
@@ -83,6 +92,58 @@ class TestSystemInfoFunctions:
         uptime = get_uptime_seconds()
         assert uptime == 0
 
+    def test_read_cpu_percent_first_call_returns_zero(self, mocker):
+        """Test CPU usage baseline call returns 0.0."""
+        stat = "cpu  100 0 100 800 0 0 0 0 0 0\n"
+        mocker.patch("builtins.open", mock_open(read_data=stat.encode()))
+
+        assert _read_cpu_percent() == 0.0
+
+    def test_read_cpu_percent_delta(self, mocker):
+        """Test CPU usage computed from the jiffies delta between calls."""
+        stat_mock = mocker.patch(
+            "builtins.open", mock_open(read_data=b"cpu  100 0 100 800 0 0 0 0 0 0\n")
+        )
+        _read_cpu_percent()
+
+        # 100 more busy jiffies and 100 more idle jiffies -> 50% usage
+        stat_mock.return_value.readline.return_value = b"cpu  200 0 100 900 0 0 0 0 0 0\n"
+        assert _read_cpu_percent() == pytest.approx(50.0)
+
+    def test_read_cpu_percent_file_error(self, mocker):
+        """Test CPU usage reading when /proc/stat is unavailable."""
+        mocker.patch("builtins.open", side_effect=FileNotFoundError)
+
+        assert _read_cpu_percent() == 0.0
+
+    def test_read_mem_percent_success(self, mocker):
+        """Test memory usage parsed from MemTotal/MemAvailable."""
+        meminfo = (
+            b"MemTotal:       1000000 kB\nMemFree:         200000 kB\nMemAvailable:    400000 kB\n"
+        )
+        mocker.patch("builtins.open", mock_open(read_data=meminfo))
+
+        assert _read_mem_percent() == pytest.approx(60.0)
+
+    def test_read_mem_percent_file_error(self, mocker):
+        """Test memory usage reading when /proc/meminfo is unavailable."""
+        mocker.patch("builtins.open", side_effect=FileNotFoundError)
+
+        assert _read_mem_percent() == 0.0
+
+    def test_read_mem_size_gb_success(self, mocker):
+        """Test total memory size parsed from MemTotal."""
+        meminfo = b"MemTotal:       1048576 kB\nMemAvailable:    400000 kB\n"
+        mocker.patch("builtins.open", mock_open(read_data=meminfo))
+
+        assert _read_mem_size_gb() == pytest.approx(1.0)
+
+    def test_read_mem_size_gb_file_error(self, mocker):
+        """Test memory size reading when /proc/meminfo is unavailable."""
+        mocker.patch("builtins.open", side_effect=FileNotFoundError)
+
+        assert _read_mem_size_gb() == 0.0
+
     def test_get_model_success(self, mock_file_operations):
         """Test successful model reading."""
         model = get_model()
@@ -131,6 +192,17 @@ model name	: ARMv7 Processor rev 3 (v7l)
         os_release = get_os_release()
         assert os_release == "Linux-5.15.0-rpi4-aarch64-with-glibc2.31"
 
+    def test_get_os_release_unquoted_pretty_name(self, mocker):
+        """Test OS release reading when PRETTY_NAME is not quoted."""
+        os_release_content = """PRETTY_NAME=Raspbian
+NAME="Raspbian GNU/Linux"
+"""
+        os_release_mock = mocker.mock_open(read_data=os_release_content)
+        mocker.patch("builtins.open", os_release_mock)
+
+        os_release = get_os_release()
+        assert os_release == "Raspbian"
+
     def test_get_os_release_no_pretty_name(self, mocker, mock_platform):
         """Test OS release reading when PRETTY_NAME is not found."""
         os_release_content = """NAME="Raspberry Pi OS Lite"
@@ -143,11 +215,8 @@ VERSION_ID="12"
         assert os_release == "Linux-5.15.0-rpi4-aarch64-with-glibc2.31"
 
     def test_get_ipv4_prefer_wlan0_exception_handling(self, mocker):
-        """Test IPv4 address detection when psutil raises an exception."""
-        # Mock psutil to raise an exception
-        mocker.patch(
-            "ha_enviro_plus.agent.psutil.net_if_addrs", side_effect=Exception("Network error")
-        )
+        """Test IPv4 address detection when the ioctl raises an exception."""
+        mocker.patch("ha_enviro_plus.agent._iface_ipv4", side_effect=Exception("Network error"))
 
         ip = get_ipv4_prefer_wlan0()
         assert ip == "unknown"
@@ -180,9 +249,7 @@ VERSION_ID="12"
         """Test OS release when /etc/os-release doesn't exist."""
         # Mock file not found and platform fallback
         mocker.patch("builtins.open", side_effect=FileNotFoundError("File not found"))
-        mocker.patch(
-            "ha_enviro_plus.agent.platform.platform", return_value="Linux-5.15.0-rpi4-aarch64"
-        )
+        mocker.patch("platform.platform", return_value="Linux-5.15.0-rpi4-aarch64")
 
         os_release = get_os_release()
         assert os_release == "Linux-5.15.0-rpi4-aarch64"
@@ -191,9 +258,7 @@ VERSION_ID="12"
         """Test OS release when both file read and platform fail."""
         # Mock both file read and platform to fail
         mocker.patch("builtins.open", side_effect=Exception("File error"))
-        mocker.patch(
-            "ha_enviro_plus.agent.platform.platform", side_effect=Exception("Platform error")
-        )
+        mocker.patch("platform.platform", side_effect=Exception("Platform error"))
 
         os_release = get_os_release()
         assert os_release == "unknown"
@@ -208,105 +273,100 @@ class TestDiscoveryPayload:
 
         assert payload["name"] == "Test Sensor"
         assert payload["uniq_id"] == "enviro_raspberrypi_test_sensor"
-        assert payload["state_topic"] == "enviro_raspberrypi/test/sensor"
+        assert payload["state_topic"] == "enviro_raspberrypi/state"
+        assert payload["value_template"] == "{{ value_json['test/sensor'] }}"
         assert payload["availability_topic"] == "enviro_raspberrypi/status"
         assert payload["unit_of_measurement"] == "°C"
         assert "device_class" not in payload
         assert payload["state_class"] == "measurement"
         assert payload["device"] == DEVICE_INFO
 
-    def test_disc_payload_with_device_class(self):
-        """Test discovery payload with device class."""
-        payload = disc_payload("test/temp", "Temperature", "°C", "temperature")
-
-        assert payload["device_class"] == "temperature"
-        assert payload["state_class"] == "measurement"
-
-    def test_disc_payload_text_sensor(self):
-        """Test discovery payload for text sensor (no unit)."""
-        payload = disc_payload("test/hostname", "Hostname", None, state_class=None)
-
-        assert "unit_of_measurement" not in payload
-        assert "state_class" not in payload
-
-    def test_disc_payload_with_icon(self):
-        """Test discovery payload with icon."""
-        payload = disc_payload("test/sensor", "Test Sensor", "°C", icon="mdi:thermometer")
-
-        assert payload["icon"] == "mdi:thermometer"
+    @pytest.mark.parametrize(
+        "args,kwargs,expected,absent",
+        [
+            # device class propagates alongside the default state class
+            (
+                ("test/temp", "Temperature", "°C", "temperature"),
+                {},
+                {"device_class": "temperature", "state_class": "measurement"},
+                (),
+            ),
+            # text sensor: no unit, state class suppressed
+            (
+                ("test/hostname", "Hostname", None),
+                {"state_class": None},
+                {},
+                ("unit_of_measurement", "state_class"),
+            ),
+            # explicit icon passes through
+            (
+                ("test/sensor", "Test Sensor", "°C"),
+                {"icon": "mdi:thermometer"},
+                {"icon": "mdi:thermometer"},
+                (),
+            ),
+        ],
+    )
+    def test_disc_payload_options(self, args, kwargs, expected, absent):
+        """Test discovery payload optional fields."""
+        payload = disc_payload(*args, **kwargs)
+
+        for key, value in expected.items():
+            assert payload[key] == value
+        for key in absent:
+            assert key not in payload
+
+
+@pytest.fixture(scope="class")
+def discovery_configs():
+    """Publish discovery once for the class and index parsed configs by topic.
+
+    The payloads are deterministic for a given device_id, so the
+    publish/parse work happens once instead of per test.
+    """
+    client = Mock()
+    with (
+        patch("ha_enviro_plus.agent.device_id", "enviro_raspberrypi"),
+        patch("ha_enviro_plus.agent.root", "enviro_raspberrypi"),
+        patch("ha_enviro_plus.agent.avail_t", "enviro_raspberrypi/status"),
+        patch("ha_enviro_plus.agent.cmd_t", "enviro_raspberrypi/cmd"),
+        patch("ha_enviro_plus.agent.set_t", "enviro_raspberrypi/set/+"),
+        patch("ha_enviro_plus.agent.state_t", "enviro_raspberrypi/state"),
+        patch("ha_enviro_plus.agent._discovery_cache", None),
+    ):
+        publish_discovery(client)
+    return {call[0][0]: json.loads(call[0][1]) for call in client.publish.call_args_list}
 
 
 class TestPublishDiscovery:
     """Test discovery publishing."""
 
-    def test_publish_discovery_sensors(self, mock_mqtt_client):
+    def test_publish_discovery_sensors(self, discovery_configs):
         """Test publishing sensor discovery."""
-        client = mock_mqtt_client.return_value
-
-        publish_discovery(client)
 
         # Should publish config for each sensor
-        expected_calls = len(SENSORS)
-        assert client.publish.call_count >= expected_calls
-
-        # Check a few specific sensor configs
-        calls = client.publish.call_args_list
-
-        # Find temperature sensor config
-        temp_config_call = None
-        for call in calls:
-            topic = call[0][0]
-            if "bme280_temperature" in topic:
-                temp_config_call = call
-                break
+        assert len(discovery_configs) >= len(SENSORS)
 
-        assert temp_config_call is not None
-        config = json.loads(temp_config_call[0][1])
+        config = discovery_configs[
+            "homeassistant/sensor/enviro_raspberrypi/bme280_temperature/config"
+        ]
         assert config["name"] == "Temperature"
         assert config["unit_of_measurement"] == "°C"
         assert config["device_class"] == "temperature"
 
-    def test_publish_discovery_buttons(self, mock_mqtt_client, mock_device_id):
+    def test_publish_discovery_buttons(self, discovery_configs):
         """Test publishing button discovery."""
-        client = mock_mqtt_client.return_value
-
-        publish_discovery(client)
 
-        calls = client.publish.call_args_list
-
-        # Find reboot button config
-        reboot_config_call = None
-        for call in calls:
-            topic = call[0][0]
-            if "button" in topic and "reboot" in topic:
-                reboot_config_call = call
-                break
-
-        assert reboot_config_call is not None
-        config = json.loads(reboot_config_call[0][1])
+        config = discovery_configs["homeassistant/button/enviro_raspberrypi/reboot/config"]
         assert config["name"] == "Reboot Enviro Zero"
         assert config["cmd_t"] == "enviro_raspberrypi/cmd"
         assert config["pl_prs"] == "reboot"
         assert config["icon"] == "mdi:restart"
 
-    def test_publish_discovery_numbers(self, mock_mqtt_client, mock_device_id):
+    def test_publish_discovery_numbers(self, discovery_configs):
         """Test publishing number entity discovery."""
-        client = mock_mqtt_client.return_value
-
-        publish_discovery(client)
-
-        calls = client.publish.call_args_list
 
-        # Find temp offset number config
-        temp_offset_config_call = None
-        for call in calls:
-            topic = call[0][0]
-            if "number" in topic and "temp_offset" in topic:
-                temp_offset_config_call = call
-                break
-
-        assert temp_offset_config_call is not None
-        config = json.loads(temp_offset_config_call[0][1])
+        config = discovery_configs["homeassistant/number/enviro_raspberrypi/temp_offset/config"]
         assert config["name"] == "Temp Offset"
         assert config["cmd_t"] == "enviro_raspberrypi/set/temp_offset"
         assert config["stat_t"] == "enviro_raspberrypi/set/temp_offset"
@@ -346,14 +406,11 @@ class TestMainFunction:
         mocker.patch("ha_enviro_plus.agent.mqtt.Client")
         mocker.patch("ha_enviro_plus.agent.EnviroPlusSensors")
         mocker.patch("ha_enviro_plus.agent.SettingsManager")
-        mocker.patch("ha_enviro_plus.agent.time.sleep", side_effect=KeyboardInterrupt)
+        mocker.patch("ha_enviro_plus.agent.asyncio.sleep", side_effect=KeyboardInterrupt)
 
         # Mock the logger to capture log messages
         mock_logger = mocker.patch("ha_enviro_plus.agent.logger")
 
-        # Import and call main
-        from ha_enviro_plus.agent import main
-
         try:
             main()
         except SystemExit as e:
@@ -369,6 +426,64 @@ class TestMainFunction:
         assert len(startup_calls) > 0
 
 
+class TestSocketOptions:
+    """Test the paho socket open hook."""
+
+    def test_on_socket_open_sets_tcp_nodelay(self):
+        """Test TCP_NODELAY is set on the broker socket."""
+        import socket as socket_module
+
+        mock_sock = Mock()
+        _on_socket_open(Mock(), None, mock_sock)
+
+        mock_sock.setsockopt.assert_called_once_with(
+            socket_module.IPPROTO_TCP, socket_module.TCP_NODELAY, 1
+        )
+
+    def test_on_socket_open_handles_errors(self):
+        """Test a failing setsockopt does not raise."""
+        mock_sock = Mock()
+        mock_sock.setsockopt.side_effect = OSError("not supported")
+
+        _on_socket_open(Mock(), None, mock_sock)
+
+
+class TestProcessTuning:
+    """Test optional CPU pinning and niceness tuning."""
+
+    def test_tuning_disabled_by_default(self, mocker):
+        """Test nothing is applied when PIN_CPU/NICE are unset."""
+        mock_affinity = mocker.patch("ha_enviro_plus.agent.os.sched_setaffinity")
+        mock_nice = mocker.patch("ha_enviro_plus.agent.os.nice")
+
+        _apply_process_tuning()
+
+        mock_affinity.assert_not_called()
+        mock_nice.assert_not_called()
+
+    def test_tuning_applies_pin_and_nice(self, mocker):
+        """Test affinity and niceness are applied when configured."""
+        mocker.patch("ha_enviro_plus.agent.PIN_CPU", "3")
+        mocker.patch("ha_enviro_plus.agent.NICE", "-5")
+        mock_affinity = mocker.patch("ha_enviro_plus.agent.os.sched_setaffinity")
+        mock_nice = mocker.patch("ha_enviro_plus.agent.os.nice")
+
+        _apply_process_tuning()
+
+        mock_affinity.assert_called_once_with(0, {3})
+        mock_nice.assert_called_once_with(-5)
+
+    def test_tuning_failure_is_non_fatal(self, mocker):
+        """Test an EPERM from the kernel does not abort startup."""
+        mocker.patch("ha_enviro_plus.agent.PIN_CPU", "3")
+        mocker.patch(
+            "ha_enviro_plus.agent.os.sched_setaffinity",
+            side_effect=OSError("Operation not permitted"),
+        )
+
+        _apply_process_tuning()
+
+
 class TestMQTTErrorScenarios:
     """Test MQTT error handling scenarios."""
 
@@ -383,8 +498,6 @@ class TestMQTTErrorScenarios:
         mock_sensors = Mock()
         mock_logger = mocker.patch("ha_enviro_plus.agent.logger")
 
-        from ha_enviro_plus.agent import on_message
-
         # Should handle decode error gracefully
         on_message(mock_client, None, mock_msg, mock_sensors)
 
@@ -402,8 +515,6 @@ class TestMQTTErrorScenarios:
         mock_sensors = Mock()
         mock_logger = mocker.patch("ha_enviro_plus.agent.logger")
 
-        from ha_enviro_plus.agent import on_message
-
         # Discovery messages are not processed by on_message, so no error should occur
         on_message(mock_client, None, mock_msg, mock_sensors)
 
@@ -420,8 +531,6 @@ class TestMQTTErrorScenarios:
         mock_sensors = Mock()
         mock_logger = mocker.patch("ha_enviro_plus.agent.logger")
 
-        from ha_enviro_plus.agent import on_message
-
         on_message(mock_client, None, mock_msg, mock_sensors)
 
         # Unknown commands are silently ignored, no logging
@@ -439,8 +548,6 @@ class TestMQTTErrorScenarios:
         mock_sensors = Mock()
         mock_logger = mocker.patch("ha_enviro_plus.agent.logger")
 
-        from ha_enviro_plus.agent import on_message
-
         on_message(mock_client, None, mock_msg, mock_sensors)
 
         # Unknown settings should log a warning
@@ -459,8 +566,6 @@ class TestMQTTErrorScenarios:
         mock_sensors = Mock()
         mock_logger = mocker.patch("ha_enviro_plus.agent.logger")
 
-        from ha_enviro_plus.agent import on_message
-
         on_message(mock_client, None, mock_msg, mock_sensors)
 
         # Invalid values should be logged as an error
@@ -473,8 +578,6 @@ class TestMQTTErrorScenarios:
         mock_client = Mock()
         mock_logger = mocker.patch("ha_enviro_plus.agent.logger")
 
-        from ha_enviro_plus.agent import on_connect
-
         # Test connection failure (rc != 0)
         on_connect(mock_client, None, None, 1)  # rc=1 indicates connection failure
 
@@ -491,8 +594,6 @@ class TestMQTTErrorScenarios:
         mock_client = Mock()
         mock_logger = mocker.patch("ha_enviro_plus.agent.logger")
 
-        from ha_enviro_plus.agent import on_connect
-
         # Test successful connection (rc = 0)
         on_connect(mock_client, None, None, 0)
 
@@ -504,294 +605,328 @@ class TestMQTTErrorScenarios:
 
 
 class TestReadAll:
-    """Test read_all function."""
+    """Test read_all function and its fast/slow split."""
+
+    def test_read_sensors_fast_keys_only(
+        self,
+        mock_bme280,
+        mock_ltr559,
+        mock_gas_sensor,
+        mock_cpu_temp,
+        mock_system_metrics,
+    ):
+        """Test read_sensors returns only the per-tick values."""
+        from ha_enviro_plus.sensors import EnviroPlusSensors
+
+        vals = read_sensors(EnviroPlusSensors())
+
+        assert set(vals.keys()) == {
+            "bme280/temperature",
+            "bme280/humidity",
+            "bme280/pressure",
+            "ltr559/lux",
+            "gas/oxidising",
+            "gas/reducing",
+            "gas/nh3",
+            "host/cpu_temp",
+            "host/cpu_usage",
+            "host/mem_usage",
+            "meta/last_update",
+        }
+
+    def test_read_host_info_slow_keys_only(
+        self, mock_system_metrics, mock_socket, mock_platform, mock_file_operations
+    ):
+        """Test read_host_info returns only the slow-changing host values."""
+        vals = read_host_info()
+
+        assert set(vals.keys()) == {
+            "host/mem_size",
+            "host/uptime",
+            "host/hostname",
+            "host/network",
+            "host/os_release",
+        }
 
     def test_read_all_complete_data(
         self,
+        mocker,
         mock_bme280,
         mock_ltr559,
         mock_gas_sensor,
-        mock_subprocess,
-        mock_psutil,
+        mock_cpu_temp,
+        mock_system_metrics,
         mock_socket,
         mock_platform,
+        mock_file_operations,
     ):
         """Test reading all sensor and system data."""
-        # Set up mock sensor data
-        mock_bme280.get_temperature.return_value = 25.5
-        mock_bme280.get_humidity.return_value = 45.0
-        mock_bme280.get_pressure.return_value = 1013.25
-        mock_ltr559.get_lux.return_value = 150.0
-        mock_subprocess.return_value = "temp=42.0'C\n"
-
-        mock_gas_sensor.oxidising = 50000.0
-        mock_gas_sensor.reducing = 30000.0
-        mock_gas_sensor.nh3 = 40000.0
-
-        # Set up mock system data
-        mock_psutil["vm"].percent = 45.2
-        mock_psutil["vm"].total = 8 * 1024 * 1024 * 1024
-        mock_psutil["cpu"].return_value = 12.5
-
-        # Mock file operations and system functions
-        def mock_open_side_effect(filename, mode="r", **kwargs):
-            if filename == "/proc/uptime":
-                return mock_open(read_data="12345.67 98765.43")()
-            elif filename == "/etc/os-release":
-                return mock_open(read_data='PRETTY_NAME="Raspberry Pi OS Lite (64-bit)"\n')()
-            else:
-                raise FileNotFoundError(f"No mock for {filename}")
-
-        with patch("builtins.open", side_effect=mock_open_side_effect):
-            with patch("os.path.exists", return_value=True):
-                with patch("ha_enviro_plus.agent.hostname", "raspberrypi"):
-                    with patch(
-                        "ha_enviro_plus.agent.get_ipv4_prefer_wlan0", return_value="192.168.1.100"
-                    ):
-                        from ha_enviro_plus.sensors import EnviroPlusSensors
-
-                        sensors = EnviroPlusSensors()
-
-                        vals = read_all(sensors)
-
-                        # Verify sensor data
-                        assert vals["bme280/temperature"] == pytest.approx(16.33, abs=0.1)
-                        assert vals["bme280/humidity"] == pytest.approx(45.0, abs=0.1)
-                        assert vals["bme280/pressure"] == pytest.approx(1013.25, abs=0.1)
-                        assert vals["ltr559/lux"] == pytest.approx(150.0, abs=0.1)
-                        assert vals["gas/oxidising"] == pytest.approx(50.0, abs=0.1)
-                        assert vals["gas/reducing"] == pytest.approx(30.0, abs=0.1)
-                        assert vals["gas/nh3"] == pytest.approx(40.0, abs=0.1)
-
-                        # Verify system data
-                        assert vals["host/cpu_temp"] == 42.0
-                        assert vals["host/cpu_usage"] == 12.5
-                        assert vals["host/mem_usage"] == 45.2
-                        assert vals["host/mem_size"] == 8.0
-                        assert vals["host/uptime"] == 12345
-                        assert vals["host/hostname"] == "raspberrypi"
-                        assert vals["host/network"] == "192.168.1.100"
-                        assert vals["host/os_release"] == "Raspberry Pi OS Lite (64-bit)"
-
-                        # Verify metadata
-                        assert "meta/last_update" in vals
-                        # Should be ISO format timestamp
-                        datetime.fromisoformat(vals["meta/last_update"].replace("Z", "+00:00"))
+        mock_cpu_temp.set(42.0)
+        mocker.patch("ha_enviro_plus.agent.hostname", "raspberrypi")
+        mocker.patch("ha_enviro_plus.agent.get_ipv4_prefer_wlan0", return_value="192.168.1.100")
 
+        from ha_enviro_plus.sensors import EnviroPlusSensors
 
-class TestOnConnect:
-    """Test MQTT on_connect handler."""
+        vals = read_all(EnviroPlusSensors())
 
-    def test_on_connect_basic(self, mock_mqtt_client, mock_device_id):
-        """Test basic on_connect functionality."""
-        client = mock_mqtt_client.return_value
+        # Verify sensor data
+        assert vals["bme280/temperature"] == pytest.approx(16.33, abs=0.1)
+        assert vals["bme280/humidity"] == pytest.approx(45.0, abs=0.1)
+        assert vals["bme280/pressure"] == pytest.approx(1013.25, abs=0.1)
+        assert vals["ltr559/lux"] == pytest.approx(150.0, abs=0.1)
+        assert vals["gas/oxidising"] == pytest.approx(50.0, abs=0.1)
+        assert vals["gas/reducing"] == pytest.approx(30.0, abs=0.1)
+        assert vals["gas/nh3"] == pytest.approx(40.0, abs=0.1)
 
-        on_connect(client, None, None, 0)
+        # Verify system data
+        assert vals["host/cpu_temp"] == 42.0
+        assert vals["host/cpu_usage"] == 12.5
+        assert vals["host/mem_usage"] == 45.2
+        assert vals["host/mem_size"] == 8.0
+        assert vals["host/uptime"] == 12345
+        assert vals["host/hostname"] == "raspberrypi"
+        assert vals["host/network"] == "192.168.1.100"
+        assert vals["host/os_release"] == "Raspberry Pi OS Lite (64-bit)"
 
-        # Should publish availability
-        calls = client.publish.call_args_list
-        availability_call = None
-        for call in calls:
-            if "status" in call[0][0]:
-                availability_call = call
-                break
+        # Verify metadata
+        assert "meta/last_update" in vals
+        # Should be ISO format timestamp
+        datetime.fromisoformat(vals["meta/last_update"].replace("Z", "+00:00"))
 
-        assert availability_call is not None
-        assert availability_call[0][1] == "online"
-        assert availability_call[1]["retain"] is True
 
-        # Should subscribe to commands and settings
-        subscribe_calls = client.subscribe.call_args_list
-        assert len(subscribe_calls) == 1
-        assert subscribe_calls[0][0][0] == [
-            ("enviro_raspberrypi/cmd", 1),
-            ("enviro_raspberrypi/set/+", 1),
-        ]
+class TestPublishState:
+    """Test aggregated state publishing."""
 
-    def test_on_connect_publishes_offsets(self, mock_mqtt_client, mock_env_vars):
-        """Test on_connect publishes current offset values."""
-        client = mock_mqtt_client.return_value
+    def test_publish_state_bundles_values(self, mock_device_id):
+        """Test all values are bundled into one JSON publish."""
+        client = Mock()
+        last_published = {}
 
-        on_connect(client, None, None, 0)
+        publish_state(client, {"bme280/temperature": 25.5, "host/hostname": "pi"}, last_published)
 
-        calls = client.publish.call_args_list
+        assert client.publish.call_count == 1
+        topic, payload = client.publish.call_args[0]
+        assert topic == "enviro_raspberrypi/state"
+        assert json.loads(payload) == {"bme280/temperature": 25.5, "host/hostname": "pi"}
+        # Telemetry is not retained; retain stays on availability/discovery
+        assert "retain" not in client.publish.call_args[1]
 
-        # Find offset publications
-        temp_offset_call = None
-        hum_offset_call = None
-        cpu_factor_call = None
+    def test_publish_state_skips_unchanged(self, mock_device_id):
+        """Test an identical bundle is not republished."""
+        client = Mock()
+        last_published = {}
 
-        for call in calls:
-            topic = call[0][0]
-            if "set/temp_offset" in topic:
-                temp_offset_call = call
-            elif "set/hum_offset" in topic:
-                hum_offset_call = call
-            elif "set/cpu_temp_factor" in topic:
-                cpu_factor_call = call
+        state = {"bme280/temperature": 25.5, "host/hostname": "pi"}
+        publish_state(client, state, last_published)
+        client.reset_mock()
 
-        assert temp_offset_call is not None
-        assert temp_offset_call[0][1] == "0.0"
-        assert temp_offset_call[1]["retain"] is True
+        publish_state(client, {"bme280/temperature": 25.5, "host/hostname": "pi"}, last_published)
 
-        assert hum_offset_call is not None
-        assert hum_offset_call[0][1] == "0.0"
-        assert hum_offset_call[1]["retain"] is True
+        assert client.publish.call_count == 0
 
-        assert cpu_factor_call is not None
-        assert cpu_factor_call[0][1] == "1.8"
-        assert cpu_factor_call[1]["retain"] is True
+    def test_publish_state_skips_timestamp_only_change(self, mock_device_id):
+        """Test a bundle differing only in meta/last_update is not resent."""
+        client = Mock()
+        last_published = {}
 
+        state = {"bme280/temperature": 25.5, "meta/last_update": "2026-08-28T00:00:00Z"}
+        publish_state(client, state, last_published)
+        client.reset_mock()
 
-class TestOnMessage:
-    """Test MQTT message handling."""
+        state = {"bme280/temperature": 25.5, "meta/last_update": "2026-08-28T00:00:02Z"}
+        publish_state(client, state, last_published)
 
-    def test_on_message_reboot_command(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
-    ):
-        """Test reboot command handling."""
-        client = mock_mqtt_client.return_value
+        assert client.publish.call_count == 0
 
-        # Create mock message
-        msg = Mock()
-        msg.topic = "enviro_raspberrypi/cmd"
-        msg.payload.decode.return_value = "reboot"
+    def test_publish_state_republishes_on_change(self, mock_device_id):
+        """Test a changed bundle is republished."""
+        client = Mock()
+        last_published = {}
 
-        with patch("ha_enviro_plus.agent.subprocess.Popen") as mock_popen:
-            on_message(client, None, msg, Mock())
+        publish_state(client, {"bme280/temperature": 25.5}, last_published)
+        client.reset_mock()
 
-            # Should publish offline status
-            calls = client.publish.call_args_list
-            offline_call = None
-            for call in calls:
-                if "status" in call[0][0] and call[0][1] == "offline":
-                    offline_call = call
-                    break
+        publish_state(client, {"bme280/temperature": 26.0}, last_published)
 
-            assert offline_call is not None
+        assert client.publish.call_count == 1
+        assert json.loads(client.publish.call_args[0][1]) == {"bme280/temperature": 26.0}
 
-            # Should call reboot command
-            mock_popen.assert_called_once_with(["sudo", "reboot"])
+    def test_publish_state_snapshot_is_retained(self, mock_device_id):
+        """Test snapshot publishes are retained for reconnecting clients."""
+        client = Mock()
+        last_published = {}
 
-    def test_on_message_shutdown_command(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
-    ):
-        """Test shutdown command handling."""
-        client = mock_mqtt_client.return_value
+        publish_state(client, {"bme280/temperature": 25.5}, last_published, snapshot=True)
 
-        msg = Mock()
-        msg.topic = "enviro_raspberrypi/cmd"
-        msg.payload.decode.return_value = "shutdown"
+        assert client.publish.call_count == 1
+        assert client.publish.call_args[1]["retain"] is True
 
-        with patch("ha_enviro_plus.agent.subprocess.Popen") as mock_popen:
-            on_message(client, None, msg, Mock())
+    def test_publish_state_snapshot_refreshes_stale_retained_copy(self, mock_device_id):
+        """Test a snapshot republishes retained even after an identical diff."""
+        client = Mock()
+        last_published = {}
 
-            # Should call shutdown command
-            mock_popen.assert_called_once_with(["sudo", "shutdown", "-h", "now"])
+        publish_state(client, {"bme280/temperature": 25.5}, last_published, snapshot=True)
+        publish_state(client, {"bme280/temperature": 26.0}, last_published)
+        client.reset_mock()
 
-    def test_on_message_restart_service_command(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
-    ):
-        """Test restart service command handling."""
-        client = mock_mqtt_client.return_value
+        # Value unchanged since the diff, but the retained copy is stale
+        publish_state(client, {"bme280/temperature": 26.0}, last_published, snapshot=True)
 
-        msg = Mock()
-        msg.topic = "enviro_raspberrypi/cmd"
-        msg.payload.decode.return_value = "restart_service"
+        assert client.publish.call_count == 1
+        assert client.publish.call_args[1]["retain"] is True
 
-        with patch("ha_enviro_plus.agent.subprocess.Popen") as mock_popen:
-            on_message(client, None, msg, Mock())
+    def test_publish_state_snapshot_skips_current_retained_copy(self, mock_device_id):
+        """Test a snapshot is suppressed when the retained copy is current."""
+        client = Mock()
+        last_published = {}
 
-            # Should call restart service command
-            mock_popen.assert_called_once_with(
-                ["sudo", "systemctl", "restart", "ha-enviro-plus.service"]
-            )
+        publish_state(client, {"bme280/temperature": 25.5}, last_published, snapshot=True)
+        client.reset_mock()
 
-    def test_on_message_temp_offset_update(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
-    ):
-        """Test temperature offset update."""
-        client = mock_mqtt_client.return_value
+        publish_state(client, {"bme280/temperature": 25.5}, last_published, snapshot=True)
 
-        msg = Mock()
-        msg.topic = "enviro_raspberrypi/set/temp_offset"
-        msg.payload.decode.return_value = "2.5"
+        assert client.publish.call_count == 0
 
-        sensors = Mock()
-        on_message(client, None, msg, sensors)
 
-        # Should update calibration
-        sensors.update_calibration.assert_called_once_with(temp_offset=2.5)
+class TestOnConnect:
+    """Test MQTT on_connect handler."""
+
+    def test_on_connect_basic(self, mqtt_client, mock_device_id):
+        """Test basic on_connect functionality."""
+
+        on_connect(mqtt_client, None, None, 0)
+
+        # Should publish availability
+        calls = mqtt_client.publish.call_args_list
+        availability_call = None
+        for publish_call in calls:
+            if "status" in publish_call[0][0]:
+                availability_call = publish_call
+                break
+
+        assert availability_call is not None
+        assert availability_call[0][1] == "online"
+        assert availability_call[1]["retain"] is True
 
-    def test_on_message_hum_offset_update(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        # Should subscribe to commands and settings
+        subscribe_calls = mqtt_client.subscribe.call_args_list
+        assert len(subscribe_calls) == 1
+        assert subscribe_calls[0][0][0] == [
+            ("enviro_raspberrypi/cmd", 1),
+            ("enviro_raspberrypi/set/+", 1),
+        ]
+
+    def test_on_connect_publishes_offsets(self, mqtt_client, mock_env_vars):
+        """Test on_connect publishes current offset values."""
+
+        from ha_enviro_plus import agent
+
+        on_connect(mqtt_client, None, None, 0)
+
+        mqtt_client.publish.assert_has_calls(
+            [
+                call(f"{agent.root}/set/temp_offset", "0.0", retain=True),
+                call(f"{agent.root}/set/hum_offset", "0.0", retain=True),
+                call(f"{agent.root}/set/cpu_temp_factor", "1.8", retain=True),
+            ],
+            any_order=True,
+        )
+
+
+class TestOnMessage:
+    """Test MQTT message handling."""
+
+    @pytest.fixture(autouse=True)
+    def mock_popen(self, mocker):
+        """Patch Popen for every test so no command handler can actually spawn."""
+        return mocker.patch("ha_enviro_plus.agent.subprocess.Popen")
+
+    @pytest.mark.parametrize(
+        "payload,argv,publishes_offline",
+        [
+            ("reboot", ("sudo", "reboot"), True),
+            ("shutdown", ("sudo", "shutdown", "-h", "now"), True),
+            (
+                "restart_service",
+                ("sudo", "systemctl", "restart", "ha-enviro-plus.service"),
+                False,
+            ),
+        ],
+    )
+    def test_on_message_system_command(
+        self, mqtt_client, mock_device_id, mock_popen, payload, argv, publishes_offline
     ):
-        """Test humidity offset update."""
-        client = mock_mqtt_client.return_value
+        """Test system command handling."""
 
         msg = Mock()
-        msg.topic = "enviro_raspberrypi/set/hum_offset"
-        msg.payload.decode.return_value = "-3.0"
+        msg.topic = "enviro_raspberrypi/cmd"
+        msg.payload.decode.return_value = payload
 
-        sensors = Mock()
-        on_message(client, None, msg, sensors)
+        on_message(mqtt_client, None, msg, Mock())
 
-        # Should update calibration
-        sensors.update_calibration.assert_called_once_with(hum_offset=-3.0)
+        mock_popen.assert_called_once_with(argv, start_new_session=True)
 
-    def test_on_message_cpu_factor_update(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        offline_calls = [
+            call
+            for call in mqtt_client.publish.call_args_list
+            if "status" in call[0][0] and call[0][1] == "offline"
+        ]
+        if publishes_offline:
+            assert offline_calls
+        else:
+            assert not offline_calls
+
+    @pytest.mark.parametrize(
+        "topic_tail,payload,expected_kwargs",
+        [
+            ("temp_offset", "2.5", {"temp_offset": 2.5}),
+            ("hum_offset", "-3.0", {"hum_offset": -3.0}),
+            ("cpu_temp_factor", "2.5", {"cpu_temp_factor": 2.5}),
+        ],
+    )
+    def test_on_message_calibration_update(
+        self, mqtt_client, mock_device_id, topic_tail, payload, expected_kwargs
     ):
-        """Test CPU temperature factor update."""
-        client = mock_mqtt_client.return_value
+        """Test calibration setting updates."""
 
         msg = Mock()
-        msg.topic = "enviro_raspberrypi/set/cpu_temp_factor"
-        msg.payload.decode.return_value = "2.5"
+        msg.topic = f"enviro_raspberrypi/set/{topic_tail}"
+        msg.payload.decode.return_value = payload
 
         sensors = Mock()
-        on_message(client, None, msg, sensors)
+        on_message(mqtt_client, None, msg, sensors)
 
-        # Should update calibration
-        sensors.update_calibration.assert_called_once_with(cpu_temp_factor=2.5)
+        sensors.update_calibration.assert_called_once_with(**expected_kwargs)
 
-    def test_on_message_invalid_command(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor
-    ):
+    def test_on_message_invalid_command(self, mqtt_client):
         """Test handling of invalid command."""
-        client = mock_mqtt_client.return_value
 
         msg = Mock()
         msg.topic = "enviro_raspberrypi/cmd"
         msg.payload.decode.return_value = "invalid_command"
 
         sensors = Mock()
-        on_message(client, None, msg, sensors)
+        on_message(mqtt_client, None, msg, sensors)
 
         # Should not call any system commands
         assert not sensors.update_calibration.called
 
-    def test_on_message_invalid_topic(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor
-    ):
+    def test_on_message_invalid_topic(self, mqtt_client):
         """Test handling of invalid topic."""
-        client = mock_mqtt_client.return_value
 
         msg = Mock()
         msg.topic = "invalid/topic"
         msg.payload.decode.return_value = "some_value"
 
         sensors = Mock()
-        on_message(client, None, msg, sensors)
+        on_message(mqtt_client, None, msg, sensors)
 
         # Should not do anything
         assert not sensors.update_calibration.called
 
-    def test_on_message_exception_handling(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor
-    ):
+    def test_on_message_exception_handling(self, mqtt_client):
         """Test exception handling in on_message."""
-        client = mock_mqtt_client.return_value
 
         msg = Mock()
         msg.topic = "enviro_raspberrypi/cmd"
@@ -800,7 +935,7 @@ class TestOnMessage:
         sensors = Mock()
 
         # Should not raise exception
-        on_message(client, None, msg, sensors)
+        on_message(mqtt_client, None, msg, sensors)
 
         # Should not call any methods
         assert not sensors.update_calibration.called
@@ -822,34 +957,36 @@ class TestConstants:
         assert DEVICE_INFO["manufacturer"] == "Pimoroni"
         assert DEVICE_INFO["model"] == "Enviro+ (no PMS5003)"
 
-    def test_sensors_structure(self):
-        """Test SENSORS structure."""
-        assert len(SENSORS) > 0
+    @pytest.mark.parametrize("sensor_key,spec", list(SENSORS.items()))
+    def test_sensors_entry_shape(self, sensor_key, spec):
+        """Test that each SENSORS entry has the expected shape."""
+        name, unit, device_class = spec
+        assert isinstance(name, str)
+        assert unit is None or isinstance(unit, str)
+        assert device_class is None or isinstance(device_class, str)
 
-        # Check that all sensors have required fields
-        for sensor_key, (name, unit, device_class) in SENSORS.items():
-            assert isinstance(name, str)
-            assert unit is None or isinstance(unit, str)
-            assert device_class is None or isinstance(device_class, str)
-
-        # Check specific sensors exist
-        assert "bme280/temperature" in SENSORS
-        assert "bme280/humidity" in SENSORS
-        assert "bme280/pressure" in SENSORS
-        assert "ltr559/lux" in SENSORS
-        assert "gas/oxidising" in SENSORS
-        assert "gas/reducing" in SENSORS
-        assert "gas/nh3" in SENSORS
+    def test_sensors_expected_keys(self):
+        """Test that the core sensor topics exist."""
+        assert len(SENSORS) > 0
+        for key in (
+            "bme280/temperature",
+            "bme280/humidity",
+            "bme280/pressure",
+            "ltr559/lux",
+            "gas/oxidising",
+            "gas/reducing",
+            "gas/nh3",
+        ):
+            assert key in SENSORS
 
 
 class TestSettingsIntegration:
     """Test settings manager integration with agent."""
 
     def test_handle_command_reset_settings(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        self, mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
     ):
         """Test reset_settings command handling."""
-        client = mock_mqtt_client.return_value
 
         # Mock settings manager
         mock_settings_manager = Mock()
@@ -859,29 +996,28 @@ class TestSettingsIntegration:
         mock_settings_manager.get_cpu_temp_factor.return_value = 1.8
         mock_settings_manager.get_cpu_temp_smoothing.return_value = 0.1
 
-        _handle_command(client, "reset_settings", mock_settings_manager)
+        _handle_command(mqtt_client, "reset_settings", mock_settings_manager)
 
         # Verify settings manager methods were called
         mock_settings_manager.reset_to_defaults.assert_called_once()
 
         # Verify MQTT publish calls for reset values
-        publish_calls = client.publish.call_args_list
+        publish_calls = mqtt_client.publish.call_args_list
         temp_offset_call = None
         hum_offset_call = None
         cpu_factor_call = None
         cpu_smoothing_call = None
 
-        for call in publish_calls:
-            topic = call[0][0]
-            value = call[0][1]
+        for publish_call in publish_calls:
+            topic = publish_call[0][0]
             if "temp_offset" in topic:
-                temp_offset_call = call
+                temp_offset_call = publish_call
             elif "hum_offset" in topic:
-                hum_offset_call = call
+                hum_offset_call = publish_call
             elif "cpu_temp_factor" in topic:
-                cpu_factor_call = call
+                cpu_factor_call = publish_call
             elif "cpu_temp_smoothing" in topic:
-                cpu_smoothing_call = call
+                cpu_smoothing_call = publish_call
 
         assert temp_offset_call is not None
         assert temp_offset_call[0][1] == "0.0"
@@ -900,19 +1036,17 @@ class TestSettingsIntegration:
         assert cpu_smoothing_call[1]["retain"] is True
 
     def test_handle_command_reset_settings_no_manager(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        self, mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
     ):
         """Test reset_settings command when no settings manager is available."""
-        client = mock_mqtt_client.return_value
 
         # Should not raise an exception
-        _handle_command(client, "reset_settings", None)
+        _handle_command(mqtt_client, "reset_settings", None)
 
     def test_handle_calibration_setting_with_settings_manager(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        self, mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
     ):
         """Test calibration setting handling with settings manager."""
-        client = mock_mqtt_client.return_value
 
         # Mock settings manager
         mock_settings_manager = Mock()
@@ -931,10 +1065,9 @@ class TestSettingsIntegration:
         mock_enviro_sensors.update_calibration.assert_called_once_with(temp_offset=2.5)
 
     def test_handle_calibration_setting_without_settings_manager(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        self, mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
     ):
         """Test calibration setting handling without settings manager."""
-        client = mock_mqtt_client.return_value
 
         # Mock enviro sensors
         mock_enviro_sensors = Mock()
@@ -947,10 +1080,9 @@ class TestSettingsIntegration:
         mock_enviro_sensors.update_calibration.assert_called_once_with(temp_offset=2.5)
 
     def test_handle_calibration_setting_invalid_value(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        self, mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
     ):
         """Test calibration setting handling with invalid value."""
-        client = mock_mqtt_client.return_value
 
         # Mock settings manager
         mock_settings_manager = Mock()
@@ -971,10 +1103,9 @@ class TestSettingsIntegration:
         mock_enviro_sensors.update_calibration.assert_not_called()
 
     def test_on_message_with_settings_manager(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        self, mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
     ):
         """Test on_message with settings manager in userdata."""
-        client = mock_mqtt_client.return_value
 
         # Mock settings manager
         mock_settings_manager = Mock()
@@ -991,7 +1122,7 @@ class TestSettingsIntegration:
         mock_enviro_sensors = Mock()
 
         with patch("ha_enviro_plus.agent._handle_calibration_setting") as mock_handler:
-            on_message(client, userdata, msg, mock_enviro_sensors)
+            on_message(mqtt_client, userdata, msg, mock_enviro_sensors)
 
             # Verify calibration handler was called with settings manager
             mock_handler.assert_called_once_with(
@@ -1002,10 +1133,9 @@ class TestSettingsIntegration:
             )
 
     def test_on_message_without_settings_manager(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        self, mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
     ):
         """Test on_message without settings manager in userdata."""
-        client = mock_mqtt_client.return_value
 
         # Mock message
         msg = Mock()
@@ -1016,7 +1146,7 @@ class TestSettingsIntegration:
         mock_enviro_sensors = Mock()
 
         with patch("ha_enviro_plus.agent._handle_calibration_setting") as mock_handler:
-            on_message(client, None, msg, mock_enviro_sensors)
+            on_message(mqtt_client, None, msg, mock_enviro_sensors)
 
             # Verify calibration handler was called without settings manager
             mock_handler.assert_called_once_with(
@@ -1024,10 +1154,9 @@ class TestSettingsIntegration:
             )
 
     def test_on_connect_with_settings_manager(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        self, mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
     ):
         """Test on_connect with settings manager in userdata."""
-        client = mock_mqtt_client.return_value
 
         # Mock settings manager
         mock_settings_manager = Mock()
@@ -1040,10 +1169,10 @@ class TestSettingsIntegration:
         userdata = {"settings_manager": mock_settings_manager}
 
         with patch("ha_enviro_plus.agent.publish_discovery"):
-            on_connect(client, userdata, None, 0)
+            on_connect(mqtt_client, userdata, None, 0)
 
             # Verify settings values were published
-            publish_calls = client.publish.call_args_list
+            publish_calls = mqtt_client.publish.call_args_list
 
             # Find the settings publish calls
             settings_calls = [call for call in publish_calls if "set/" in call[0][0]]
@@ -1068,20 +1197,19 @@ class TestSettingsIntegration:
             assert cpu_smoothing_call[0][1] == "0.3"
 
     def test_on_connect_without_settings_manager(
-        self, mock_mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
+        self, mqtt_client, mock_bme280, mock_ltr559, mock_gas_sensor, mock_device_id
     ):
         """Test on_connect without settings manager falls back to environment variables."""
-        client = mock_mqtt_client.return_value
 
         with patch("ha_enviro_plus.agent.publish_discovery"):
             with patch("ha_enviro_plus.agent.TEMP_OFFSET", 0.0):
                 with patch("ha_enviro_plus.agent.HUM_OFFSET", 0.0):
                     with patch("ha_enviro_plus.agent.CPU_TEMP_FACTOR", 1.8):
                         with patch("ha_enviro_plus.agent.CPU_TEMP_SMOOTHING", 0.1):
-                            on_connect(client, None, None, 0)
+                            on_connect(mqtt_client, None, None, 0)
 
                             # Verify environment variable values were published
-                            publish_calls = client.publish.call_args_list
+                            publish_calls = mqtt_client.publish.call_args_list
 
                             # Find the settings publish calls
                             settings_calls = [
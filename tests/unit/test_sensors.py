@@ -51,38 +51,33 @@ class TestEnviroPlusSensorsInit:
 class TestCpuTemperature:
     """Test CPU temperature reading."""
 
-    def test_read_cpu_temp_success(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
-    ):
+    def test_read_cpu_temp_success(self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp):
         """Test successful CPU temperature reading."""
-        mock_subprocess.return_value = "temp=42.5'C\n"  # Return string, not bytes
+        mock_cpu_temp.set(42.5)
 
         sensors = EnviroPlusSensors()
         temp = sensors._read_cpu_temp()
 
         assert temp == 42.5
-        mock_subprocess.assert_called_once_with(["vcgencmd", "measure_temp"], text=True)
 
-    def test_read_cpu_temp_failure(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
-    ):
+    def test_read_cpu_temp_failure(self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp):
         """Test CPU temperature reading failure."""
-        mock_subprocess.side_effect = Exception("Command failed")
+        mock_cpu_temp.fail()
 
         sensors = EnviroPlusSensors()
 
-        with pytest.raises(Exception, match="Command failed"):
+        with pytest.raises(OSError):
             sensors._read_cpu_temp()
 
     def test_read_cpu_temp_malformed_output(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
-        """Test CPU temperature reading with malformed output."""
-        mock_subprocess.return_value = "invalid output"
+        """Test CPU temperature reading with malformed content."""
+        mock_cpu_temp.write_raw("invalid output\n")
 
         sensors = EnviroPlusSensors()
 
-        with pytest.raises(IndexError):
+        with pytest.raises(ValueError):
             sensors._read_cpu_temp()
 
 
@@ -100,10 +95,10 @@ class TestCpuTemperatureSmoothing:
         assert sensors._cpu_temp_last_update == 0.0
 
     def test_get_smoothed_cpu_temp_first_reading(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test smoothed CPU temperature on first reading."""
-        mock_subprocess.return_value = "temp=45.0'C\n"
+        mock_cpu_temp.set(45.0)
 
         sensors = EnviroPlusSensors(cpu_temp_smoothing=0.1)
         temp = sensors._get_smoothed_cpu_temp()
@@ -113,11 +108,11 @@ class TestCpuTemperatureSmoothing:
         assert sensors._cpu_temp_last_update > 0.0
 
     def test_get_smoothed_cpu_temp_subsequent_readings(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test smoothed CPU temperature on subsequent readings."""
         # First reading: 45.0°C (replaces initialization value)
-        mock_subprocess.return_value = "temp=45.0'C\n"
+        mock_cpu_temp.set(45.0)
         sensors = EnviroPlusSensors(cpu_temp_smoothing=0.2)
         first_temp = sensors._get_smoothed_cpu_temp()
 
@@ -125,7 +120,7 @@ class TestCpuTemperatureSmoothing:
         assert sensors._cpu_temp_smoothed == 45.0
 
         # Second reading: 50.0°C
-        mock_subprocess.return_value = "temp=50.0'C\n"
+        mock_cpu_temp.set(50.0)
         second_temp = sensors._get_smoothed_cpu_temp()
 
         # EMA calculation: 0.2 * 50.0 + 0.8 * 45.0 = 10.0 + 36.0 = 46.0
@@ -134,7 +129,7 @@ class TestCpuTemperatureSmoothing:
         assert sensors._cpu_temp_smoothed == pytest.approx(expected, abs=0.01)
 
     def test_get_smoothed_cpu_temp_multiple_readings(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test smoothed CPU temperature with multiple readings."""
         sensors = EnviroPlusSensors(cpu_temp_smoothing=0.3)
@@ -144,7 +139,7 @@ class TestCpuTemperatureSmoothing:
         expected_smoothed = []
 
         for reading in readings:
-            mock_subprocess.return_value = f"temp={reading}'C\n"
+            mock_cpu_temp.set(reading)
             smoothed = sensors._get_smoothed_cpu_temp()
             expected_smoothed.append(smoothed)
 
@@ -159,28 +154,28 @@ class TestCpuTemperatureSmoothing:
         assert expected_smoothed[2] == pytest.approx(44.05, abs=0.01)
 
     def test_get_smoothed_cpu_temp_failure_fallback(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test smoothed CPU temperature fallback on failure."""
         # First successful reading
-        mock_subprocess.return_value = "temp=45.0'C\n"
+        mock_cpu_temp.set(45.0)
         sensors = EnviroPlusSensors(cpu_temp_smoothing=0.1)
         first_temp = sensors._get_smoothed_cpu_temp()
 
         assert first_temp == 45.0
 
         # Subsequent failure
-        mock_subprocess.side_effect = Exception("Command failed")
+        mock_cpu_temp.fail()
         fallback_temp = sensors._get_smoothed_cpu_temp()
 
         # Should return last known smoothed value
         assert fallback_temp == 45.0
 
     def test_get_smoothed_cpu_temp_failure_no_previous_value(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test smoothed CPU temperature fallback when no previous value."""
-        mock_subprocess.side_effect = Exception("Command failed")
+        mock_cpu_temp.fail()
 
         sensors = EnviroPlusSensors(cpu_temp_smoothing=0.1)
         temp = sensors._get_smoothed_cpu_temp()
@@ -188,11 +183,9 @@ class TestCpuTemperatureSmoothing:
         # Should return 0.0 when no previous reading (indicates no valid temperature)
         assert temp == 0.0
 
-    def test_cpu_temp_public_method(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
-    ):
+    def test_cpu_temp_public_method(self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp):
         """Test public cpu_temp method."""
-        mock_subprocess.return_value = "temp=42.0'C\n"
+        mock_cpu_temp.set(42.0)
 
         sensors = EnviroPlusSensors(cpu_temp_smoothing=0.1)
         temp = sensors.cpu_temp()
@@ -200,10 +193,10 @@ class TestCpuTemperatureSmoothing:
         assert temp == 42.0
 
     def test_smoothing_factor_boundaries(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test CPU temperature smoothing with different smoothing factors."""
-        mock_subprocess.return_value = "temp=50.0'C\n"
+        mock_cpu_temp.set(50.0)
 
         # Test with smoothing factor = 1.0 (no smoothing)
         sensors_no_smooth = EnviroPlusSensors(cpu_temp_smoothing=1.0)
@@ -228,10 +221,10 @@ class TestTemperatureCompensation:
     """Test temperature compensation calculations."""
 
     def test_apply_temp_compensation(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test temperature compensation formula with smoothed CPU temp."""
-        mock_subprocess.return_value = "temp=50.0'C\n"  # CPU temp
+        mock_cpu_temp.set(50.0)  # CPU temp
 
         sensors = EnviroPlusSensors(cpu_temp_factor=2.0)
         raw_temp = 25.0
@@ -245,10 +238,10 @@ class TestTemperatureCompensation:
         assert compensated == expected
 
     def test_apply_temp_compensation_cpu_failure(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test temperature compensation when CPU temp reading fails."""
-        mock_subprocess.side_effect = Exception("CPU temp failed")
+        mock_cpu_temp.fail()
 
         sensors = EnviroPlusSensors()
         raw_temp = 25.0
@@ -263,11 +256,11 @@ class TestTemperatureReadings:
     """Test temperature reading methods."""
 
     def test_temp_with_compensation_and_offset(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test compensated temperature with offset."""
         mock_bme280.get_temperature.return_value = 25.0
-        mock_subprocess.return_value = "temp=50.0'C\n"
+        mock_cpu_temp.set(50.0)
 
         sensors = EnviroPlusSensors(temp_offset=2.0, cpu_temp_factor=2.0)
         temp = sensors.temp()
@@ -295,11 +288,11 @@ class TestTemperatureReadings:
         ],
     )
     def test_temp_with_various_offsets(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess, offset, expected
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp, offset, expected
     ):
         """Test temperature with various offset values."""
         mock_bme280.get_temperature.return_value = 25.5
-        mock_subprocess.return_value = "temp=25.5'C\n"  # Same as raw temp
+        mock_cpu_temp.set(25.5)  # Same as raw temp
 
         sensors = EnviroPlusSensors(temp_offset=offset)
         temp = sensors.temp()
@@ -470,7 +463,7 @@ class TestCalibration:
         sensors.update_calibration(temp_offset=2.5)
 
         assert sensors.temp_offset == 2.5
-        mock_logger.info.assert_called_with("Updated temperature offset to %s°C", 2.5)
+        mock_logger.info.assert_called_with("Calibration updated: %s", "temp_offset=2.5°C")
 
     def test_update_calibration_hum_offset(
         self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_logger
@@ -481,7 +474,7 @@ class TestCalibration:
         sensors.update_calibration(hum_offset=-3.0)
 
         assert sensors.hum_offset == -3.0
-        mock_logger.info.assert_called_with("Updated humidity offset to %s%%", -3.0)
+        mock_logger.info.assert_called_with("Calibration updated: %s", "hum_offset=-3.0%")
 
     def test_update_calibration_cpu_factor(
         self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_logger
@@ -492,7 +485,7 @@ class TestCalibration:
         sensors.update_calibration(cpu_temp_factor=2.5)
 
         assert sensors.cpu_temp_factor == 2.5
-        mock_logger.info.assert_called_with("Updated CPU temperature factor to %s", 2.5)
+        mock_logger.info.assert_called_with("Calibration updated: %s", "cpu_temp_factor=2.5")
 
     def test_update_calibration_cpu_smoothing(
         self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_logger
@@ -503,7 +496,7 @@ class TestCalibration:
         sensors.update_calibration(cpu_temp_smoothing=0.3)
 
         assert sensors.cpu_temp_smoothing == 0.3
-        mock_logger.info.assert_called_with("Updated CPU temperature smoothing to %s", 0.3)
+        mock_logger.info.assert_called_with("Calibration updated: %s", "cpu_temp_smoothing=0.3")
 
     def test_update_calibration_multiple(
         self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_logger
@@ -520,21 +513,25 @@ class TestCalibration:
         assert sensors.cpu_temp_factor == 2.0
         assert sensors.cpu_temp_smoothing == 0.2
 
-        # Should log initialization + each update
-        assert mock_logger.info.call_count == 5
+        # Should log initialization + one coalesced update line
+        assert mock_logger.info.call_count == 2
+        mock_logger.info.assert_called_with(
+            "Calibration updated: %s",
+            "temp_offset=1.5°C, hum_offset=-2.0%, cpu_temp_factor=2.0, cpu_temp_smoothing=0.2",
+        )
 
 
 class TestGetAllSensorData:
     """Test get_all_sensor_data method."""
 
-    def test_get_all_sensor_data(self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess):
+    def test_get_all_sensor_data(self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp):
         """Test getting all sensor data."""
         # Set up mock return values
         mock_bme280.get_temperature.return_value = 25.5
         mock_bme280.get_humidity.return_value = 45.0
         mock_bme280.get_pressure.return_value = 1013.25
         mock_ltr559.get_lux.return_value = 150.0
-        mock_subprocess.return_value = "temp=42.0'C\n"
+        mock_cpu_temp.set(42.0)
 
         sensors = EnviroPlusSensors(temp_offset=1.0, hum_offset=2.0)
         data = sensors.get_all_sensor_data()
@@ -578,11 +575,11 @@ class TestEdgeCases:
     """Test edge cases and error conditions."""
 
     def test_extreme_cpu_temperature(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test with extreme CPU temperature."""
         mock_bme280.get_temperature.return_value = 25.0
-        mock_subprocess.return_value = "temp=100.0'C\n"  # Very hot CPU
+        mock_cpu_temp.set(100.0)  # Very hot CPU
 
         sensors = EnviroPlusSensors(cpu_temp_factor=1.0)
         temp = sensors.temp()
@@ -592,21 +589,21 @@ class TestEdgeCases:
         assert temp < 25.0  # Should be compensated down
 
     def test_negative_temperature_offset(
-        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess
+        self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp
     ):
         """Test with negative temperature offset."""
         mock_bme280.get_temperature.return_value = 25.0
-        mock_subprocess.return_value = "temp=25.0'C\n"
+        mock_cpu_temp.set(25.0)
 
         sensors = EnviroPlusSensors(temp_offset=-10.0)
         temp = sensors.temp()
 
         assert temp == 15.0  # 25.0 - 10.0
 
-    def test_zero_cpu_temp_factor(self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_subprocess):
+    def test_zero_cpu_temp_factor(self, mock_bme280, mock_ltr559, mock_gas_sensor, mock_cpu_temp):
         """Test with zero CPU temperature factor (should not divide by zero)."""
         mock_bme280.get_temperature.return_value = 25.0
-        mock_subprocess.return_value = "temp=50.0'C\n"
+        mock_cpu_temp.set(50.0)
 
         sensors = EnviroPlusSensors(cpu_temp_factor=0.0)
 
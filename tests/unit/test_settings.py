@@ -56,6 +56,27 @@ class TestSettingsManager:
                     assert manager.get_cpu_temp_factor() == 2.5
                     assert manager.get_cpu_temp_smoothing() == 0.3
 
+    def test_set_setting_skips_save_when_unchanged(self):
+        """Test that rewriting an identical value does not hit the disk."""
+        with patch("ha_enviro_plus.settings.Path") as mock_path_class:
+            with patch("os.chmod"):
+                with patch("builtins.open", mock_open()):
+                    mock_path_instance = Mock()
+                    mock_path_instance.mkdir = Mock()
+                    mock_path_instance.exists.return_value = False
+                    mock_path_instance.__truediv__ = Mock(return_value=mock_path_instance)
+                    mock_path_instance.with_suffix.return_value = mock_path_instance
+                    mock_path_class.return_value = mock_path_instance
+
+                    manager = SettingsManager()
+                    manager.set_temp_offset(1.5)
+
+                    with patch.object(manager, "_save_settings") as mock_save:
+                        manager.set_temp_offset(1.5)
+
+                    mock_save.assert_not_called()
+                    assert manager.get_temp_offset() == 1.5
+
     def test_reset_to_defaults(self):
         """Test that reset_to_defaults works correctly."""
         with patch("ha_enviro_plus.settings.Path") as mock_path_class: